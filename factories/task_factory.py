@@ -1,22 +1,121 @@
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
 from posts.models import Task
+from posts.scheduler import FREQUENCIES, next_occurrence
+
+class TaskBatchError(ValueError):
+    """Raised by create_tasks; errors maps item index -> message."""
+
+    def __init__(self, errors):
+        super().__init__("Invalid tasks in batch")
+        self.errors = errors
 
 class TaskFactory:
+    PRIORITY_LEVELS = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
     @staticmethod
-    def create_task(task_type, title, description, assigned_to, metadata=None):
+    def priority_rank(value):
+        """Map a priority_level such as 'High' or 3 to its sortable rank."""
+        if isinstance(value, str) and value.lower() in TaskFactory.PRIORITY_LEVELS:
+            return TaskFactory.PRIORITY_LEVELS[value.lower()]
+        if isinstance(value, int) and not isinstance(value, bool) and value in TaskFactory.PRIORITY_LEVELS.values():
+            return value
+        raise ValueError(f"'priority_level' must be one of: {', '.join(TaskFactory.PRIORITY_LEVELS)}")
+
+    @staticmethod
+    def validate(task_type, metadata):
         if task_type not in ["regular", "priority", "recurring"]:
             raise ValueError("Invalid task type")
 
+        metadata = metadata or {}
+        if not isinstance(metadata, dict):
+            raise ValueError("'metadata' must be an object")
+
         if task_type == "priority" and "priority_level" not in metadata:
             raise ValueError("Priority tasks require 'priority_level'")
 
+        if task_type == "priority":
+            TaskFactory.priority_rank(metadata["priority_level"])
+
         if task_type == "recurring" and "frequency" not in metadata:
             raise ValueError("Recurring tasks require 'frequency'")
 
-        return Task.objects.create(
+        if task_type == "recurring" and str(metadata["frequency"]).lower() not in FREQUENCIES:
+            raise ValueError(f"'frequency' must be one of: {', '.join(FREQUENCIES)}")
+
+    @staticmethod
+    def priority(task_type, metadata):
+        if task_type != "priority":
+            return None
+        return TaskFactory.priority_rank(metadata["priority_level"])
+
+    @staticmethod
+    def first_run(task_type, metadata):
+        """When the scheduler should create the first occurrence after this one."""
+        if task_type != "recurring":
+            return None
+        return next_occurrence(timezone.now(), metadata["frequency"])
+
+    @staticmethod
+    def build_task(task_type, title, description, assigned_to, metadata=None):
+        TaskFactory.validate(task_type, metadata)
+        return Task(
             title=title,
             description=description,
             assigned_to=assigned_to,
             task_type=task_type,
-            metadata=metadata
-        )
\ No newline at end of file
+            metadata=metadata,
+            priority_level=TaskFactory.priority(task_type, metadata),
+            next_run_at=TaskFactory.first_run(task_type, metadata)
+        )
+
+    @staticmethod
+    def create_task(task_type, title, description, assigned_to, metadata=None):
+        task = TaskFactory.build_task(task_type, title, description, assigned_to, metadata)
+        task.save()
+        return task
+
+    @staticmethod
+    def create_tasks(items, batch_size=500):
+        """
+        Create many tasks at once. Every item is validated up front, all
+        assignees are loaded with one in_bulk query and the rows go in with
+        bulk_create in a single transaction. If any item is invalid nothing
+        is created and TaskBatchError lists the problems by index.
+        """
+        errors = {}
+        assignee_ids = {}
+        for index, item in enumerate(items):
+            try:
+                assignee_ids[index] = int(item['assigned_to'])
+            except (KeyError, TypeError, ValueError):
+                errors[index] = "assigned_to must be a user ID"
+
+        users = User.objects.in_bulk(set(assignee_ids.values()))
+
+        tasks = []
+        for index, item in enumerate(items):
+            if index in errors:
+                continue
+            try:
+                if not item.get('title'):
+                    raise ValueError("Title is required")
+                assigned_to = users.get(assignee_ids[index])
+                if assigned_to is None:
+                    raise ValueError("Assigned user not found")
+                tasks.append(TaskFactory.build_task(
+                    task_type=item.get('task_type', 'regular'),
+                    title=item['title'],
+                    description=item.get('description', ''),
+                    assigned_to=assigned_to,
+                    metadata=item.get('metadata', {})
+                ))
+            except ValueError as e:
+                errors[index] = str(e)
+
+        if errors:
+            raise TaskBatchError(dict(sorted(errors.items())))
+
+        with transaction.atomic():
+            return Task.objects.bulk_create(tasks, batch_size=batch_size)
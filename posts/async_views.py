@@ -0,0 +1,81 @@
+# ASGI-native read endpoints. They mirror the hot GET paths in views.py
+# using Django's async ORM, so slow clients don't each hold a thread.
+from functools import wraps
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import APIException
+from .authentication import aauthenticate
+from .cache import aget_cached_detail, aset_cached_detail
+from .models import Post, Comment, Task
+from .pagination import KeysetPagination
+from .serializers import PostSerializer, CommentSerializer, TaskSerializer
+from .views import filter_tasks, get_comments_limit
+
+def async_token_required(view):
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await aauthenticate(request)
+        if user is None:
+            return JsonResponse(
+                {'detail': 'Authentication credentials were not provided.'},
+                status=401, headers={'WWW-Authenticate': 'Token'}
+            )
+        request.user = user
+        try:
+            return await view(request, *args, **kwargs)
+        except APIException as exc:
+            # Same body shape as DRF's exception handler
+            data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+            return JsonResponse(data, status=exc.status_code, safe=False)
+    return wrapper
+
+@require_GET
+@async_token_required
+async def post_list(request):
+    paginator = KeysetPagination()
+    queryset = PostSerializer.setup_eager_loading(
+        Post.objects.all(), comments_limit=get_comments_limit(request)
+    )
+    posts = await paginator.apaginate_queryset(queryset, request)
+    # Everything is prefetched, so serializing does no further I/O
+    serializer = PostSerializer(posts, many=True)
+    return JsonResponse(paginator.get_paginated_data(serializer.data))
+
+@require_GET
+@async_token_required
+async def post_detail(request, pk):
+    comments_limit = get_comments_limit(request)
+    variant = 'full' if comments_limit is None else f'latest-{comments_limit}'
+    data = await aget_cached_detail(Post, pk, variant)
+    if data is None:
+        queryset = PostSerializer.setup_eager_loading(Post.objects.all(), comments_limit=comments_limit)
+        try:
+            post = await queryset.aget(pk=pk)
+        except Post.DoesNotExist:
+            return JsonResponse({'detail': 'Not found.'}, status=404)
+        data = PostSerializer(post).data
+        await aset_cached_detail(post, data, variant)
+    return JsonResponse(data)
+
+@require_GET
+@async_token_required
+async def comment_list(request):
+    comments = Comment.objects.select_related('author')
+    post_id = request.GET.get('post')
+    if post_id is not None:
+        if not post_id.isdigit():
+            return JsonResponse({'error': 'post must be a post ID'}, status=400)
+        comments = comments.filter(post_id=post_id)
+    paginator = KeysetPagination()
+    page = await paginator.apaginate_queryset(comments, request)
+    serializer = CommentSerializer(page, many=True)
+    return JsonResponse(paginator.get_paginated_data(serializer.data))
+
+@require_GET
+@async_token_required
+async def task_list(request):
+    tasks = filter_tasks(Task.objects.filter(assigned_to=request.user), request.GET)
+    paginator = KeysetPagination()
+    page = await paginator.apaginate_queryset(tasks, request)
+    serializer = TaskSerializer(page, many=True)
+    return JsonResponse(paginator.get_paginated_data(serializer.data))
@@ -0,0 +1,160 @@
+import copy
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.authtoken.models import Token
+from singletons.config_manager import ConfigManager
+from .cache import LRUCache
+
+config = ConfigManager()
+
+token_cache = LRUCache(
+    maxsize=config.get_setting('AUTH_TOKEN_CACHE_SIZE'),
+    ttl=config.get_setting('AUTH_TOKEN_CACHE_TTL'),
+)
+
+# Rejected keys are remembered too, under their own entries, so an unknown
+# token is looked up once per TTL rather than on every request. The cached
+# messages are TokenAuthentication's.
+rejected_token_cache = LRUCache(
+    maxsize=config.get_setting('AUTH_TOKEN_CACHE_SIZE'),
+    ttl=config.get_setting('AUTH_TOKEN_CACHE_TTL'),
+)
+INVALID_TOKEN = 'Invalid token.'
+INACTIVE_USER = 'User inactive or deleted.'
+
+def _shared_key(key):
+    return f'authtoken:{key}'
+
+def _rejected_key(key):
+    return f'authtoken-rejected:{key}'
+
+def get_cached_credentials(key):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        return cache.get(_shared_key(key))
+    return token_cache.get(key)
+
+def set_cached_credentials(key, credentials):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        cache.set(_shared_key(key), credentials, config.get_setting('AUTH_TOKEN_CACHE_TTL'))
+    else:
+        token_cache.set(key, credentials)
+
+async def aget_cached_credentials(key):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        return await cache.aget(_shared_key(key))
+    return token_cache.get(key)
+
+async def aset_cached_credentials(key, credentials):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        await cache.aset(_shared_key(key), credentials, config.get_setting('AUTH_TOKEN_CACHE_TTL'))
+    else:
+        token_cache.set(key, credentials)
+
+def get_cached_rejection(key):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        return cache.get(_rejected_key(key))
+    return rejected_token_cache.get(key)
+
+def set_cached_rejection(key, message):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        cache.set(_rejected_key(key), message, config.get_setting('AUTH_TOKEN_CACHE_TTL'))
+    else:
+        rejected_token_cache.set(key, message)
+
+async def aget_cached_rejection(key):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        return await cache.aget(_rejected_key(key))
+    return rejected_token_cache.get(key)
+
+async def aset_cached_rejection(key, message):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        await cache.aset(_rejected_key(key), message, config.get_setting('AUTH_TOKEN_CACHE_TTL'))
+    else:
+        rejected_token_cache.set(key, message)
+
+def is_cached_token(key):
+    """True if key is cached as a valid token; no database access and no unpickling."""
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        return cache.has_key(_shared_key(key))
+    return token_cache.get(key) is not None
+
+async def ais_cached_token(key):
+    if config.get_setting('AUTH_TOKEN_CACHE_SHARED'):
+        return await cache.ahas_key(_shared_key(key))
+    return token_cache.get(key) is not None
+
+def evict_token(key):
+    token_cache.delete(key)
+    rejected_token_cache.delete(key)
+    cache.delete_many([_shared_key(key), _rejected_key(key)])
+
+def evict_user_tokens(user):
+    """Drop every cached token of a user whose state or access changed."""
+    for key in Token.objects.filter(user=user).values_list('key', flat=True):
+        evict_token(key)
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that remembers token -> user for AUTH_TOKEN_CACHE_TTL.
+
+    Entries live in the Django cache by default (AUTH_TOKEN_CACHE_SHARED),
+    so evictions reach every worker only when that cache is shared between
+    processes, e.g. Redis via REDIS_URL. With LocMemCache, or with
+    AUTH_TOKEN_CACHE_SHARED off (an in-process LRU), other workers keep
+    accepting a revoked token for up to AUTH_TOKEN_CACHE_TTL; only use
+    those with one worker.
+    Views that revoke tokens or change a user must call evict_token or
+    evict_user_tokens.
+    """
+
+    def authenticate_credentials(self, key):
+        credentials = get_cached_credentials(key)
+        if credentials is None:
+            rejection = get_cached_rejection(key)
+            if rejection is not None:
+                raise AuthenticationFailed(rejection)
+            try:
+                credentials = super().authenticate_credentials(key)
+            except AuthenticationFailed as exc:
+                set_cached_rejection(key, str(exc.detail))
+                raise
+            set_cached_credentials(key, credentials)
+        user, token = credentials
+        # Hand each request its own instance so nothing leaks between requests
+        return copy.copy(user), token
+
+def token_is_valid(key):
+    """True if key is the token of an active user; leaves it cached for the view."""
+    try:
+        CachedTokenAuthentication().authenticate_credentials(key)
+    except AuthenticationFailed:
+        return False
+    return True
+
+async def aauthenticate_key(key):
+    """Async token -> user lookup through the same cache, or None."""
+    credentials = await aget_cached_credentials(key)
+    if credentials is None:
+        if await aget_cached_rejection(key) is not None:
+            return None
+        try:
+            token = await Token.objects.select_related('user').aget(key=key)
+        except Token.DoesNotExist:
+            token = None
+        if token is None or not token.user.is_active:
+            await aset_cached_rejection(key, INVALID_TOKEN if token is None else INACTIVE_USER)
+            return None
+        credentials = (token.user, token)
+        await aset_cached_credentials(key, credentials)
+    return copy.copy(credentials[0])
+
+async def aauthenticate(request):
+    """
+    Async counterpart of CachedTokenAuthentication for plain async views.
+    Returns the user for a valid "Token <key>" header, otherwise None.
+    """
+    auth = request.headers.get('Authorization', '').split()
+    if len(auth) != 2 or auth[0].lower() != 'token':
+        return None
+    return await aauthenticate_key(auth[1])
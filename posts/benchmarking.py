@@ -0,0 +1,45 @@
+from contextlib import contextmanager
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from singletons.config_manager import ConfigManager
+from .seeding import Seeder
+
+@contextmanager
+def benchmark_database(verbosity=0):
+    """
+    Run a benchmark against a throwaway test database, so seeding and load
+    never touch real data. Rate limiting is switched off for the duration.
+    """
+    config = ConfigManager()
+    rate_limit = config.get_setting('RATE_LIMIT')
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=verbosity, autoclobber=True, serialize=False)
+    config.set_setting('RATE_LIMIT', None)
+    try:
+        yield
+    finally:
+        config.set_setting('RATE_LIMIT', rate_limit)
+        connection.creation.destroy_test_db(old_name, verbosity)
+        teardown_test_environment()
+
+def percentiles(samples, points=(50, 95, 99)):
+    """Nearest-rank percentiles of samples, keyed 'p50', 'p95', ..."""
+    if not samples:
+        return {f'p{point}': None for point in points}
+    ordered = sorted(samples)
+    return {
+        f'p{point}': ordered[min(len(ordered) - 1, max(0, round(point / 100 * len(ordered)) - 1))]
+        for point in points
+    }
+
+def seed_dataset(users=50, posts=1000, comments=10000, tasks=2000, seed=0, batch_size=500):
+    """
+    Load a reproducible dataset with posts.seeding.Seeder: every user gets
+    a token, comments follow a heavy-tailed distribution over posts (a few
+    posts hold most of them) and tasks mix the three types. Returns the
+    users in id order.
+    """
+    seeder = Seeder(seed=seed, batch_size=batch_size, password='BenchUser123!', prefix='bench_user_')
+    user_ids = seeder.run(users, posts, comments, tasks)
+    return list(User.objects.filter(pk__in=user_ids).order_by('id'))
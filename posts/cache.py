@@ -0,0 +1,153 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from django.core.cache import cache
+from singletons.config_manager import ConfigManager
+
+config = ConfigManager()
+
+class LRUCache:
+    """Small thread-safe in-process LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+class CacheStats:
+    """Process-wide hit/miss counters for the detail cache, per model."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: defaultdict(int))
+
+    def incr(self, label, event):
+        with self._lock:
+            self._counters[label][event] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {label: dict(events) for label, events in self._counters.items()}
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+stats = CacheStats()
+
+# Detail responses are stored under model, pk and updated_at:
+#   detail:posts.post:5                          -> (updated_at, generation)
+#   detail:posts.post:5:<updated_at>:<gen>:<variant> -> serialized payload
+# Invalidation only drops the pointer; the next write starts a new
+# generation so orphaned payloads are unreachable until they expire.
+
+def _label(model):
+    return model._meta.label_lower
+
+def _version_key(model, pk):
+    return f'detail:{_label(model)}:{pk}'
+
+def _data_key(model, pk, version, variant):
+    updated_at, generation = version
+    return f'{_version_key(model, pk)}:{updated_at}:{generation}:{variant}'
+
+def get_cached_detail(model, pk, variant='full'):
+    version = cache.get(_version_key(model, pk))
+    if version is not None:
+        data = cache.get(_data_key(model, pk, version, variant))
+        if data is not None:
+            stats.incr(_label(model), 'hits')
+            return data
+    stats.incr(_label(model), 'misses')
+    return None
+
+def get_cached_updated_at(model, pk):
+    """updated_at of the cached version, or None; lets validators skip the database."""
+    version = cache.get(_version_key(model, pk))
+    if version is None:
+        return None
+    return datetime.fromisoformat(version[0])
+
+def set_cached_detail(instance, data, variant='full'):
+    model = type(instance)
+    version_key = _version_key(model, instance.pk)
+    updated_at = instance.updated_at.isoformat()
+    current = cache.get(version_key)
+    if current is not None and current[0] > updated_at:
+        # A slow reader must not roll the pointer back to an older row
+        return
+    if current is not None and current[0] == updated_at:
+        version = current
+    else:
+        version = (updated_at, uuid.uuid4().hex[:12])
+    cache.set_many({
+        version_key: version,
+        _data_key(model, instance.pk, version, variant): data,
+    }, config.get_setting('DETAIL_CACHE_TIMEOUT'))
+    stats.incr(_label(model), 'sets')
+
+async def aget_cached_detail(model, pk, variant='full'):
+    version = await cache.aget(_version_key(model, pk))
+    if version is not None:
+        data = await cache.aget(_data_key(model, pk, version, variant))
+        if data is not None:
+            stats.incr(_label(model), 'hits')
+            return data
+    stats.incr(_label(model), 'misses')
+    return None
+
+async def aset_cached_detail(instance, data, variant='full'):
+    model = type(instance)
+    version_key = _version_key(model, instance.pk)
+    updated_at = instance.updated_at.isoformat()
+    current = await cache.aget(version_key)
+    if current is not None and current[0] > updated_at:
+        return
+    if current is not None and current[0] == updated_at:
+        version = current
+    else:
+        version = (updated_at, uuid.uuid4().hex[:12])
+    await cache.aset_many({
+        version_key: version,
+        _data_key(model, instance.pk, version, variant): data,
+    }, config.get_setting('DETAIL_CACHE_TIMEOUT'))
+    stats.incr(_label(model), 'sets')
+
+def invalidate_detail(model, *pks):
+    if not pks:
+        return
+    cache.delete_many([_version_key(model, pk) for pk in pks])
+    stats.incr(_label(model), 'invalidations')
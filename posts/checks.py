@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+@register(Tags.caches, deploy=True)
+def check_shared_cache(app_configs, **kwargs):
+    """Cross-worker invalidation (tokens, roles, detail cache) needs a shared cache."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [Warning(
+        f'The default cache ({backend}) is local to each process.',
+        hint='Set REDIS_URL or configure another cross-process cache backend. Until then '
+             'logouts, deleted users, role changes and detail cache invalidations only take '
+             'effect in the worker that handled them.',
+        id='posts.W001',
+    )]
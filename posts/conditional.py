@@ -0,0 +1,118 @@
+import hashlib
+from functools import wraps
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, parse_etags, quote_etag
+from django.views.decorators.http import condition
+from .cache import get_cached_updated_at
+from .pagination import KeysetPagination
+
+# Validators are computed before the view runs, so a matching
+# If-None-Match / If-Modified-Since is answered with 304 without loading
+# or serializing anything. Each request computes them at most once.
+
+def _memoize(request, key, compute):
+    validators = getattr(request, '_validators', None)
+    if validators is None:
+        validators = request._validators = {}
+    if key not in validators:
+        validators[key] = compute()
+    return validators[key]
+
+def version_tag(updated_at):
+    return format(int(updated_at.timestamp() * 1000000), 'x')
+
+def detail_etag(instance):
+    return quote_etag(f'{instance._meta.model_name}-{instance.pk}-{version_tag(instance.updated_at)}')
+
+def is_conditional(request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+def detail_updated_at(model, request, pk):
+    def lookup():
+        # The detail cache pointer already knows updated_at for hot rows
+        updated_at = get_cached_updated_at(model, pk)
+        if updated_at is None and is_conditional(request):
+            updated_at = model.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+        return updated_at
+    return _memoize(request, 'detail', lookup)
+
+def set_validators(response, instance):
+    """Validators for responses built from a freshly loaded row."""
+    response.headers.setdefault('ETag', detail_etag(instance))
+    if not response.has_header('Last-Modified'):
+        response['Last-Modified'] = http_date(instance.updated_at.timestamp())
+    return response
+
+def detail_condition(model):
+    """
+    ETag and Last-Modified for a detail view taking pk, from updated_at.
+    Unconditional requests on a cold cache skip the lookup; the view adds
+    the validators with set_validators once it has loaded the row.
+    """
+    def etag(request, pk):
+        updated_at = detail_updated_at(model, request, pk)
+        if updated_at is None:
+            return None
+        return f'{model._meta.model_name}-{pk}-{version_tag(updated_at)}'
+
+    def last_modified(request, pk):
+        return detail_updated_at(model, request, pk)
+
+    return method_decorator(condition(etag_func=etag, last_modified_func=last_modified))
+
+def _page_row(item):
+    if isinstance(item, dict):
+        return item['pk'], item['updated_at']
+    return item.pk, item.updated_at
+
+def page_etag(name, paginator):
+    """ETag for the page a paginator just produced: its rows and its neighbours."""
+    rows = ';'.join(f'{pk}:{version_tag(updated_at)}' for pk, updated_at in map(_page_row, paginator.page))
+    digest = hashlib.sha1(f'{rows}|{paginator.has_next:d}{paginator.has_previous:d}'.encode()).hexdigest()
+    return quote_etag(f'{name}-{digest[:20]}')
+
+def collection_paginator(request):
+    """The paginator collection_condition set up for this request."""
+    return _memoize(request, 'paginator', KeysetPagination)
+
+def collection_condition(get_queryset, get_paginator=None):
+    """
+    ETag for a keyset-paginated list view, taken from the page being
+    served: pk and updated_at of each row plus whether there are pages
+    either side, so edits, inserts and deletes that touch the page all
+    change it. The view must paginate with collection_paginator(request).
+
+    Only requests carrying If-None-Match pay for a lookup up front: the
+    page's (pk, updated_at) pairs, one bounded index scan, so a match is
+    answered with 304 before anything is loaded or serialized. Other
+    requests are tagged from the page the view loaded anyway. Last-Modified
+    is not sent: it cannot see deletes.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(self, request, *args, **kwargs):
+            paginator = _memoize(
+                request, 'paginator', lambda: get_paginator(request) if get_paginator else KeysetPagination()
+            )
+            name = get_queryset.__name__
+            if request.method in ('GET', 'HEAD') and 'HTTP_IF_NONE_MATCH' in request.META:
+                rows = paginator.prepare_queryset(get_queryset(request).values('pk', 'updated_at'), request)
+                paginator.finish_page(list(rows))
+                not_modified = get_conditional_response(request, etag=page_etag(name, paginator))
+                if not_modified is not None:
+                    return not_modified
+            response = view(self, request, *args, **kwargs)
+            if response.status_code == 200 and hasattr(paginator, 'page'):
+                response.headers.setdefault('ETag', page_etag(name, paginator))
+            return response
+        return wrapper
+    return decorator
+
+def if_match_passes(request, etag):
+    """Strong If-Match comparison (RFC 9110); True when the header is absent."""
+    header = request.META.get('HTTP_IF_MATCH')
+    if header is None:
+        return True
+    etags = parse_etags(header)
+    return '*' in etags or etag in etags
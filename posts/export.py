@@ -0,0 +1,48 @@
+from datetime import datetime
+from django.core.serializers.json import DjangoJSONEncoder
+from .models import Post, Comment, Task
+from .pagination import seek_filter
+
+# kind -> (model, exported columns)
+EXPORTS = {
+    'posts': (Post, ('id', 'content', 'author_id', 'comment_count', 'created_at', 'updated_at')),
+    'comments': (Comment, ('id', 'content', 'author_id', 'post_id', 'created_at', 'updated_at')),
+    'tasks': (Task, ('id', 'title', 'description', 'assigned_to_id', 'task_type', 'metadata', 'created_at', 'updated_at')),
+}
+
+class ExportJSONEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # Keep microseconds so updated_at can be fed back as ?since=
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+def iter_rows(model, fields, since=None, batch_size=1000):
+    """
+    Yield rows as dicts in (updated_at, id) order. Each batch is a fresh
+    keyset query read through .iterator(), so memory stays flat whatever
+    the table size.
+    """
+    ordering = ('updated_at', 'id')
+    queryset = model.objects.order_by(*ordering).values(*fields)
+    if since is not None:
+        queryset = queryset.filter(updated_at__gt=since)
+
+    position = None
+    while True:
+        batch = queryset
+        if position is not None:
+            batch = batch.filter(seek_filter(ordering, position))
+        count = 0
+        for row in batch[:batch_size].iterator(chunk_size=batch_size):
+            count += 1
+            position = (row['updated_at'], row['id'])
+            yield row
+        if count < batch_size:
+            return
+
+def iter_ndjson(kind, since=None, batch_size=1000):
+    model, fields = EXPORTS[kind]
+    encoder = ExportJSONEncoder(separators=(',', ':'))
+    for row in iter_rows(model, fields, since=since, batch_size=batch_size):
+        yield encoder.encode(row) + '\n'
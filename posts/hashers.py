@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+class ConfigurableArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2 with its cost parameters taken from settings.ARGON2_TIME_COST,
+    ARGON2_MEMORY_COST and ARGON2_PARALLELISM. Hashes made with other
+    parameters are upgraded the next time the user logs in.
+    """
+
+    @property
+    def time_cost(self):
+        return getattr(settings, 'ARGON2_TIME_COST', Argon2PasswordHasher.time_cost)
+
+    @property
+    def memory_cost(self):
+        return getattr(settings, 'ARGON2_MEMORY_COST', Argon2PasswordHasher.memory_cost)
+
+    @property
+    def parallelism(self):
+        return getattr(settings, 'ARGON2_PARALLELISM', Argon2PasswordHasher.parallelism)
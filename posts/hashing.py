@@ -0,0 +1,50 @@
+import threading
+from contextlib import contextmanager
+from singletons.config_manager import ConfigManager
+
+config = ConfigManager()
+
+class HashingBusy(Exception):
+    """Raised when the password hashing queue is full; answer with 503."""
+
+class HashingGate:
+    """
+    Bounds how many password hashes (Argon2 by default) run at once, so
+    a burst of logins cannot take every worker away from the read path.
+
+    At most PASSWORD_HASH_CONCURRENCY callers hash at a time. Up to
+    PASSWORD_HASH_QUEUE more wait, for at most PASSWORD_HASH_WAIT seconds.
+    Anyone beyond that is turned away at once with HashingBusy.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+
+    @contextmanager
+    def slot(self):
+        max_active = config.get_setting('PASSWORD_HASH_CONCURRENCY')
+        with self._condition:
+            if self.active >= max_active:
+                if self.waiting >= config.get_setting('PASSWORD_HASH_QUEUE'):
+                    raise HashingBusy()
+                self.waiting += 1
+                try:
+                    acquired = self._condition.wait_for(
+                        lambda: self.active < max_active,
+                        timeout=config.get_setting('PASSWORD_HASH_WAIT')
+                    )
+                finally:
+                    self.waiting -= 1
+                if not acquired:
+                    raise HashingBusy()
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.active -= 1
+                self._condition.notify()
+
+password_hashing = HashingGate()
@@ -0,0 +1,153 @@
+import json
+import logging
+import platform
+import time
+import tracemalloc
+from datetime import datetime, timezone
+import django
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from posts.authentication import token_cache
+from posts.benchmarking import benchmark_database, percentiles, seed_dataset
+from posts.middleware import QueryTimer
+from posts.models import Post
+
+class Command(BaseCommand):
+    help = 'Seed a dataset in a throwaway database and measure latency, queries and memory per endpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Measured requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per endpoint')
+        parser.add_argument('--memory-requests', type=int, default=10,
+                            help='Requests per endpoint replayed under tracemalloc')
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--posts', type=int, default=1000)
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument('--tasks', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--endpoint', action='append', dest='endpoints',
+                            help='Only run this endpoint; may be repeated')
+        parser.add_argument('--output', help='Write the results as JSON to this file')
+        parser.add_argument('--compare', help='Earlier --output file to show p95 changes against')
+
+    def handle(self, *args, **options):
+        if options['requests'] < 1:
+            raise CommandError('--requests must be at least 1')
+        baseline = None
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+
+        # Keep per-request log lines out of the report
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        logging.getLogger('task_logger').setLevel(logging.WARNING)
+        cache.clear()
+        token_cache.clear()
+        with benchmark_database():
+            seed_started = time.perf_counter()
+            users = seed_dataset(
+                users=options['users'], posts=options['posts'], comments=options['comments'],
+                tasks=options['tasks'], seed=options['seed'],
+            )
+            seed_seconds = time.perf_counter() - seed_started
+            if not users or not options['posts']:
+                raise CommandError('Need at least one user and one post')
+
+            client = Client(HTTP_AUTHORIZATION=f'Token {users[0].auth_token.key}')
+            endpoints = self.endpoints()
+            names = options['endpoints'] or list(endpoints)
+            unknown = set(names) - set(endpoints)
+            if unknown:
+                raise CommandError(f'Unknown endpoints: {", ".join(sorted(unknown))}')
+
+            results = {}
+            for name in names:
+                path = endpoints[name]
+                results[name] = self.measure(client, path, options)
+
+        report = {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'options': {key: options[key] for key in (
+                'requests', 'warmup', 'users', 'posts', 'comments', 'tasks', 'seed'
+            )},
+            'seed_seconds': round(seed_seconds, 3),
+            'endpoints': results,
+        }
+        self.print_table(results, baseline)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+
+    def endpoints(self):
+        # The most commented post stands in for a hot thread
+        hot = Post.objects.order_by('-comment_count', '-id').values_list('id', flat=True).first()
+        feed = reverse('post-list-create')
+        return {
+            'feed': feed,
+            'feed_engagement': f'{feed}?sort=engagement',
+            'post_detail': reverse('post-detail', args=[hot]),
+            'comments': f'{reverse("comment-list-create")}?post={hot}',
+            'tasks': reverse('task_list'),
+            'tasks_priority': f'{reverse("task_list")}?task_type=priority',
+            'next_tasks': reverse('next_tasks'),
+        }
+
+    def measure(self, client, path, options):
+        for _ in range(options['warmup']):
+            client.get(path, secure=True)
+
+        latencies = []
+        queries = []
+        statuses = {}
+        for _ in range(options['requests']):
+            timer = QueryTimer()
+            began = time.perf_counter()
+            with connection.execute_wrapper(timer):
+                response = client.get(path, secure=True)
+            latencies.append((time.perf_counter() - began) * 1000)
+            queries.append(timer.count)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        # tracemalloc slows every allocation, so memory gets its own pass
+        tracemalloc.start()
+        try:
+            for _ in range(options['memory_requests']):
+                tracemalloc.reset_peak()
+                client.get(path, secure=True)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        result = {f'{key}_ms': round(value, 3) for key, value in percentiles(latencies).items()}
+        result.update({
+            'path': path,
+            'mean_ms': round(sum(latencies) / len(latencies), 3) if latencies else None,
+            'queries_per_request': sum(queries) / len(queries) if queries else None,
+            'max_queries': max(queries, default=None),
+            'peak_memory_kib': round(peak / 1024, 1),
+            'statuses': {str(code): count for code, count in sorted(statuses.items())},
+        })
+        return result
+
+    def print_table(self, results, baseline):
+        header = f'{"endpoint":<18}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"queries":>9}{"peak KiB":>10}'
+        if baseline:
+            header += f'{"p95 vs base":>13}'
+        self.stdout.write(header)
+        for name, result in results.items():
+            line = (
+                f'{name:<18}{result["p50_ms"]:>9.2f}{result["p95_ms"]:>9.2f}{result["p99_ms"]:>9.2f}'
+                f'{result["queries_per_request"]:>9.1f}{result["peak_memory_kib"]:>10.1f}'
+            )
+            before = (baseline or {}).get('endpoints', {}).get(name)
+            if before and before.get('p95_ms'):
+                change = (result['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+                line += f'{change:>+12.1f}%'
+            self.stdout.write(line)
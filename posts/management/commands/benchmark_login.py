@@ -0,0 +1,90 @@
+import logging
+import threading
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import Client
+from rest_framework.authtoken.models import Token
+from posts.benchmarking import benchmark_database, percentiles
+from posts.models import Post
+from singletons.config_manager import ConfigManager
+
+class Command(BaseCommand):
+    help = 'Show login throughput against feed latency, with and without the password hashing gate'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5, help='Seconds per phase')
+        parser.add_argument('--login-threads', type=int, default=16)
+
+    def handle(self, *args, **options):
+        # Rejected logins are expected here; don't log each 503
+        logging.getLogger('django.request').setLevel(logging.ERROR)
+        with benchmark_database():
+            self.seed()
+            config = ConfigManager()
+            saved = config.get_setting('PASSWORD_HASH_CONCURRENCY')
+            try:
+                rows = [('reads only', self.phase(options['duration'], 0))]
+                config.set_setting('PASSWORD_HASH_CONCURRENCY', 10 ** 6)
+                rows.append(('logins, unbounded', self.phase(options['duration'], options['login_threads'])))
+                config.set_setting('PASSWORD_HASH_CONCURRENCY', saved)
+                rows.append((f'logins, gate={saved}', self.phase(options['duration'], options['login_threads'])))
+            finally:
+                config.set_setting('PASSWORD_HASH_CONCURRENCY', saved)
+
+        self.stdout.write(f'{"phase":<22}{"logins/s":>10}{"503s":>7}{"read p50 ms":>13}{"read p95 ms":>13}')
+        for name, result in rows:
+            self.stdout.write(
+                f'{name:<22}{result["logins_per_second"]:>10.1f}{result["rejected"]:>7}'
+                f'{result["read_p50_ms"]:>13.1f}{result["read_p95_ms"]:>13.1f}'
+            )
+
+    def seed(self):
+        self.reader = User.objects.create_user(username='bench_reader', password='BenchReader123!')
+        self.token = Token.objects.create(user=self.reader)
+        User.objects.create_user(username='bench_login', password='BenchLogin123!')
+        Post.objects.bulk_create([Post(content=f'Post {i}', author=self.reader) for i in range(50)])
+
+    def phase(self, duration, login_threads):
+        stop = threading.Event()
+        counts = {'ok': 0, 'rejected': 0}
+        lock = threading.Lock()
+
+        def login_worker():
+            client = Client()
+            try:
+                while not stop.is_set():
+                    response = client.post(
+                        '/api/users/login/', {'username': 'bench_login', 'password': 'BenchLogin123!'},
+                        content_type='application/json', secure=True
+                    )
+                    with lock:
+                        counts['ok' if response.status_code == 200 else 'rejected'] += 1
+            finally:
+                connections.close_all()
+
+        workers = [threading.Thread(target=login_worker) for _ in range(login_threads)]
+        for worker in workers:
+            worker.start()
+
+        reader = Client(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        latencies = []
+        start = time.perf_counter()
+        while time.perf_counter() - start < duration:
+            began = time.perf_counter()
+            reader.get('/api/', secure=True)
+            latencies.append((time.perf_counter() - began) * 1000)
+        elapsed = time.perf_counter() - start
+
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+        read = percentiles(latencies, (50, 95))
+        return {
+            'logins_per_second': counts['ok'] / elapsed,
+            'rejected': counts['rejected'],
+            'read_p50_ms': read['p50'],
+            'read_p95_ms': read['p95'],
+        }
@@ -0,0 +1,66 @@
+import time
+from django.db import connection
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from rest_framework.authtoken.models import Token
+from posts.authentication import token_is_valid
+from posts.benchmarking import benchmark_database, seed_dataset
+from posts.middleware import QueryTimer, RateLimitMiddleware, limiter
+from singletons.config_manager import ConfigManager
+
+class Command(BaseCommand):
+    help = 'Measure the per-request overhead of RateLimitMiddleware for token and IP clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100000)
+        # Kept below LocMemCache's default MAX_ENTRIES so warm tokens stay cached
+        parser.add_argument('--clients', type=int, default=100)
+
+    def handle(self, *args, **options):
+        config = ConfigManager()
+        factory = RequestFactory()
+        middleware = RateLimitMiddleware(lambda request: HttpResponse())
+
+        with benchmark_database():
+            seed_dataset(users=options['clients'], posts=0, comments=0, tasks=0)
+            keys = list(Token.objects.values_list('key', flat=True))
+            # Real tokens, verified once so the limiter sees them as cached
+            for key in keys:
+                token_is_valid(key)
+            paths = {
+                'token': [factory.get('/api/', HTTP_AUTHORIZATION=f'Token {key}') for key in keys],
+                'ip': [
+                    factory.get('/api/', REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}')
+                    for i in range(options['clients'])
+                ],
+            }
+
+            def run(requests, rate_limit, backend):
+                config.set_setting('RATE_LIMIT', rate_limit)
+                config.set_setting('RATE_LIMIT_BACKEND', backend)
+                limiter.reset()
+                total = options['requests']
+                timer = QueryTimer()
+                with connection.execute_wrapper(timer):
+                    start = time.perf_counter()
+                    for i in range(total):
+                        middleware(requests[i % len(requests)])
+                    elapsed = time.perf_counter() - start
+                return elapsed / total * 1e9, timer.count
+
+            saved_backend = config.get_setting('RATE_LIMIT_BACKEND')
+            try:
+                for name, requests in paths.items():
+                    # Large limit so every request takes the allow path
+                    baseline, _ = run(requests, None, 'local')
+                    self.stdout.write(f'{name} clients')
+                    self.stdout.write(f'  disabled:        {baseline:8.0f} ns/request')
+                    for label, backend in (('local buckets', 'local'), ('shared (cache)', 'cache')):
+                        cost, queries = run(requests, 10 ** 9, backend)
+                        self.stdout.write(
+                            f'  {label + ":":<17}{cost:8.0f} ns/request (+{cost - baseline:.0f}), {queries} queries'
+                        )
+            finally:
+                config.set_setting('RATE_LIMIT_BACKEND', saved_backend)
+                limiter.reset()
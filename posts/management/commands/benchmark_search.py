@@ -0,0 +1,57 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from posts.benchmarking import benchmark_database, percentiles
+from posts.models import Post
+from posts.search import attach_results, build_match, search_available, search_page
+from posts.seeding import Seeder
+
+class Command(BaseCommand):
+    help = 'Compare first-page latency of the FTS5 search index against icontains scans'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=50000)
+        parser.add_argument('--comments', type=int, default=0)
+        parser.add_argument('--repeat', type=int, default=20, help='Runs per term')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if not search_available():
+            raise CommandError('Full-text search needs the SQLite backend')
+        with benchmark_database():
+            seeder = Seeder(seed=options['seed'])
+            seeder.run(10, options['posts'], options['comments'], 0)
+            # Words are drawn by Zipf rank: the first are in most posts, the last in almost none
+            words = seeder.words
+            buckets = {
+                'common': words[:3],
+                'medium': words[200:203],
+                'rare': words[-3:],
+                # No match at all: the scan has to read every row
+                'missing': ['qqxz'],
+            }
+            self.stdout.write(f'{"terms":<8}{"index p50":>11}{"index p95":>11}{"scan p50":>10}{"scan p95":>10}{"matches":>9}')
+            for name, terms in buckets.items():
+                indexed, scanned = [], []
+                for term in terms:
+                    for _ in range(options['repeat']):
+                        indexed.append(self.timed(self.search, term, options['page_size']))
+                        scanned.append(self.timed(self.scan, term, options['page_size']))
+                hits = len(search_page('posts', build_match(terms[0]), limit=-1))
+                index, scan = percentiles(indexed, (50, 95)), percentiles(scanned, (50, 95))
+                self.stdout.write(
+                    f'{name:<8}{index["p50"]:>11.2f}{index["p95"]:>11.2f}'
+                    f'{scan["p50"]:>10.2f}{scan["p95"]:>10.2f}{hits:>9}'
+                )
+
+    def timed(self, func, *args):
+        began = time.perf_counter()
+        func(*args)
+        return (time.perf_counter() - began) * 1000
+
+    def search(self, term, page_size):
+        match = build_match(term)
+        return attach_results('posts', match, search_page('posts', match, limit=page_size + 1))
+
+    def scan(self, term, page_size):
+        return list(Post.objects.select_related('author').filter(content__icontains=term).order_by('-id')[:page_size + 1])
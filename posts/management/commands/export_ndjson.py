@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+from posts.export import EXPORTS, iter_ndjson
+
+class Command(BaseCommand):
+    help = 'Stream posts, comments or tasks as NDJSON, optionally only rows updated since a timestamp'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(EXPORTS))
+        parser.add_argument('--since', help='Only export rows with updated_at after this ISO timestamp')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--output', help='File to write to (default: stdout)')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError('--since must be an ISO 8601 timestamp')
+
+        count = 0
+        lines = iter_ndjson(options['kind'], since=since, batch_size=options['batch_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                for line in lines:
+                    output.write(line)
+                    count += 1
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
+                count += 1
+        self.stderr.write(self.style.SUCCESS(f'Exported {count} {options["kind"]}'))
@@ -0,0 +1,14 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from posts.models import Tombstone
+from singletons.config_manager import ConfigManager
+
+class Command(BaseCommand):
+    help = 'Delete sync tombstones older than TOMBSTONE_RETENTION_DAYS'
+
+    def handle(self, *args, **kwargs):
+        days = ConfigManager().get_setting('TOMBSTONE_RETENTION_DAYS')
+        # Clients holding older cursors get 410 from /sync/ and start over
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+        self.stdout.write(self.style.SUCCESS(f'Deleted {deleted} tombstones older than {days} days'))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from posts.models import Post, Comment
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized Post.comment_count from the comments table'
+
+    def handle(self, *args, **kwargs):
+        # One correlated UPDATE instead of a read/modify/write per post
+        counts = (
+            Comment.objects.filter(post=OuterRef('pk'))
+            .order_by()
+            .values('post')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        updated = Post.objects.update(
+            comment_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+        )
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt comment counts for {updated} posts'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand, CommandError
+from posts.search import SEARCH_INDEXES, rebuild_index, search_available
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index from the posts and comments tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*', help=f'Any of {", ".join(SEARCH_INDEXES)}; default: all')
+        parser.add_argument('--optimize', action='store_true', help='Also merge index segments')
+
+    def handle(self, *args, **options):
+        if not search_available():
+            raise CommandError('Full-text search needs the SQLite backend')
+        kinds = options['kinds'] or list(SEARCH_INDEXES)
+        unknown = set(kinds) - set(SEARCH_INDEXES)
+        if unknown:
+            raise CommandError(f'Unknown index: {", ".join(sorted(unknown))}')
+        rebuild_index(kinds, optimize=options['optimize'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search index for {", ".join(kinds)}'))
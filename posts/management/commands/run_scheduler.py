@@ -0,0 +1,20 @@
+import time
+from django.core.management.base import BaseCommand
+from posts import scheduler
+
+class Command(BaseCommand):
+    help = 'Materialize due occurrences of recurring tasks, once or in a loop'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run a single tick and exit')
+        parser.add_argument('--interval', type=float, default=60, help='Seconds between ticks')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        while True:
+            created = scheduler.tick(batch_size=options['batch_size'])
+            if created:
+                self.stdout.write(self.style.SUCCESS(f'Materialized {created} task occurrences'))
+            if options['once']:
+                return
+            time.sleep(options['interval'])
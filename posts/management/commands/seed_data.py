@@ -0,0 +1,63 @@
+import time
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from posts.seeding import Seeder, TASK_TYPES, fast_load
+from factories.task_factory import TaskFactory
+
+def weights(value, names):
+    try:
+        parsed = [float(part) for part in value.split(',')]
+    except ValueError:
+        parsed = []
+    if len(parsed) != len(names) or any(weight < 0 for weight in parsed) or not any(parsed):
+        raise CommandError(f'Expected {len(names)} comma-separated weights for {", ".join(names)}')
+    return parsed
+
+class Command(BaseCommand):
+    help = 'Bulk-load deterministic synthetic users, tokens, posts, comments and tasks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--posts', type=int, default=100000)
+        parser.add_argument('--comments', type=int, default=1000000)
+        parser.add_argument('--tasks', type=int, default=100000)
+        parser.add_argument('--seed', type=int, default=0, help='Same seed, same data')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--comment-alpha', type=float, default=1.2,
+                            help='Pareto shape of comments per post; lower is more skewed')
+        parser.add_argument('--task-mix', default='6,3,1', help='Weights for regular,priority,recurring')
+        parser.add_argument('--priority-mix', default='1,1,1,1', help='Weights for low,medium,high,critical')
+        parser.add_argument('--prefix', default='seed_user_', help='Username prefix for seeded users')
+        parser.add_argument('--password', default='SeedUser123!', help='Password shared by seeded users')
+
+    def handle(self, *args, **options):
+        for name in ('users', 'posts', 'comments', 'tasks'):
+            if options[name] < 0:
+                raise CommandError(f'--{name} cannot be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        if options['comment_alpha'] <= 0:
+            raise CommandError('--comment-alpha must be positive')
+        if options['users'] == 0 and (options['posts'] or options['tasks']):
+            raise CommandError('Posts and tasks need at least one user')
+        if User.objects.filter(username__startswith=options['prefix']).exists():
+            raise CommandError(f'Users named {options["prefix"]}* already exist; pick another --prefix')
+
+        seeder = Seeder(
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            comment_alpha=options['comment_alpha'],
+            task_mix=weights(options['task_mix'], TASK_TYPES),
+            priority_mix=weights(options['priority_mix'], list(TaskFactory.PRIORITY_LEVELS)),
+            password=options['password'],
+            prefix=options['prefix'],
+            progress=self.stdout.write if options['verbosity'] > 1 else None,
+        )
+        started = time.perf_counter()
+        with fast_load():
+            seeder.run(options['users'], options['posts'], options['comments'], options['tasks'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {options["users"]} users, {options["posts"]} posts, {options["comments"]} comments '
+            f'and {options["tasks"]} tasks in {elapsed:.1f}s'
+        ))
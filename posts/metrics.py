@@ -0,0 +1,109 @@
+import bisect
+import threading
+from collections import defaultdict, deque
+from .cache import stats as cache_stats
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# (metric name, help text, buckets); label values are resolved URL names
+HISTOGRAMS = {
+    'duration': ('http_request_duration_seconds', 'Wall time per request.', DURATION_BUCKETS),
+    'queries': ('http_request_db_queries', 'Database queries per request.', QUERY_BUCKETS),
+    'db_time': ('http_request_db_duration_seconds', 'Database time per request.', DURATION_BUCKETS),
+    'size': ('http_response_size_bytes', 'Response body size.', SIZE_BUCKETS),
+}
+
+class Histogram:
+    """Fixed-bucket histogram; observe() is a bisect and two additions."""
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One slot per bound plus the implicit +Inf bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        total = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            yield bound, total
+
+class RequestMetrics:
+    """Per-view request histograms plus a record of query-heavy requests."""
+
+    def __init__(self, recent_size=50):
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._over_threshold = defaultdict(int)
+        self.recent_over_threshold = deque(maxlen=recent_size)
+
+    def observe(self, view, duration, queries, db_time, size=None):
+        with self._lock:
+            histograms = self._histograms.get(view)
+            if histograms is None:
+                histograms = self._histograms[view] = {
+                    kind: Histogram(buckets) for kind, (_, _, buckets) in HISTOGRAMS.items()
+                }
+            histograms['duration'].observe(duration)
+            histograms['queries'].observe(queries)
+            histograms['db_time'].observe(db_time)
+            if size is not None:
+                histograms['size'].observe(size)
+
+    def flag(self, view, path, queries):
+        with self._lock:
+            self._over_threshold[view] += 1
+            self.recent_over_threshold.append({'view': view, 'path': path, 'queries': queries})
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._over_threshold.clear()
+            self.recent_over_threshold.clear()
+
+    def render(self, include_cache=True):
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            for kind, (name, help_text, _) in HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for view in sorted(self._histograms):
+                    histogram = self._histograms[view][kind]
+                    label = _escape(view)
+                    for bound, total in histogram.cumulative():
+                        le = '+Inf' if bound == float('inf') else _number(bound)
+                        lines.append(f'{name}_bucket{{view="{label}",le="{le}"}} {total}')
+                    lines.append(f'{name}_sum{{view="{label}"}} {_number(histogram.sum)}')
+                    lines.append(f'{name}_count{{view="{label}"}} {histogram.count}')
+            lines.append('# HELP http_requests_over_query_threshold_total Requests above METRICS_QUERY_THRESHOLD queries.')
+            lines.append('# TYPE http_requests_over_query_threshold_total counter')
+            for view in sorted(self._over_threshold):
+                lines.append(
+                    f'http_requests_over_query_threshold_total{{view="{_escape(view)}"}} {self._over_threshold[view]}'
+                )
+        if include_cache:
+            lines.append('# HELP detail_cache_events_total Detail cache events per model.')
+            lines.append('# TYPE detail_cache_events_total counter')
+            for label, events in sorted(cache_stats.snapshot().items()):
+                for event, count in sorted(events.items()):
+                    lines.append(f'detail_cache_events_total{{model="{_escape(label)}",event="{event}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+request_metrics = RequestMetrics()
@@ -0,0 +1,275 @@
+import hashlib
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.http import JsonResponse
+from singletons.config_manager import ConfigManager
+from singletons.logger_singleton import LoggerSingleton
+from .authentication import aauthenticate_key, ais_cached_token, is_cached_token, token_is_valid
+from .metrics import request_metrics
+
+config = ConfigManager()
+logger = LoggerSingleton().get_logger()
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per client key. Each check is O(1) and
+    the number of tracked clients is bounded by evicting the least
+    recently seen one.
+    """
+
+    def __init__(self, max_keys=100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = OrderedDict()
+
+    def allow(self, key, capacity, period, now=None):
+        """Take one token for key; return (allowed, seconds until retry)."""
+        now = time.monotonic() if now is None else now
+        rate = capacity / period
+        with self._lock:
+            tokens, last = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * rate)
+            if tokens >= 1:
+                tokens -= 1
+                retry_after = 0
+            else:
+                retry_after = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return retry_after == 0, retry_after
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+def shared_allow(key, capacity, period, now=None):
+    """
+    Multi-worker variant on the Django cache: a fixed window counter per
+    client, which approximates the bucket with one atomic incr per request.
+    """
+    now = time.time() if now is None else now
+    window = int(now // period)
+    cache_key = f'ratelimit:{key}:{window}'
+    cache.add(cache_key, 0, period)
+    try:
+        count = cache.incr(cache_key)
+    except ValueError:
+        # The window expired between add and incr
+        cache.add(cache_key, 1, period)
+        count = 1
+    if count <= capacity:
+        return True, 0
+    return False, (window + 1) * period - now
+
+async def ashared_allow(key, capacity, period, now=None):
+    now = time.time() if now is None else now
+    window = int(now // period)
+    cache_key = f'ratelimit:{key}:{window}'
+    await cache.aadd(cache_key, 0, period)
+    try:
+        count = await cache.aincr(cache_key)
+    except ValueError:
+        await cache.aadd(cache_key, 1, period)
+        count = 1
+    if count <= capacity:
+        return True, 0
+    return False, (window + 1) * period - now
+
+limiter = TokenBucketLimiter()
+
+def _request_token(request):
+    auth = request.META.get('HTTP_AUTHORIZATION', '').split()
+    if len(auth) == 2 and auth[0].lower() == 'token':
+        return auth[1]
+    return None
+
+def _token_key(token):
+    # Never keep raw tokens around as dictionary or cache keys
+    return 'token:' + hashlib.sha256(token.encode()).hexdigest()[:32]
+
+def _ip_key(request):
+    return 'ip:' + request.META.get('REMOTE_ADDR', '')
+
+def client_key(request):
+    """Rate limit key when there is no token: the session user, else the IP."""
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+    return _ip_key(request)
+
+async def aclient_key(request):
+    if settings.SESSION_COOKIE_NAME in request.COOKIES and hasattr(request, 'auser'):
+        user = await request.auser()
+        if user.is_authenticated:
+            return f'user:{user.pk}'
+    return _ip_key(request)
+
+def rate_limited_response(retry_after):
+    response = JsonResponse({'error': 'Rate limit exceeded'}, status=429)
+    response['Retry-After'] = str(math.ceil(retry_after))
+    return response
+
+class RateLimitMiddleware:
+    """
+    Token-bucket rate limiting from ConfigManager: RATE_LIMIT requests per
+    RATE_LIMIT_PERIOD seconds per client. RATE_LIMIT_BACKEND 'cache'
+    shares counters between workers. A falsy RATE_LIMIT disables it.
+    Runs natively under both WSGI and ASGI.
+
+    A token already cached as valid is its own client. Any other token is
+    first charged to the caller's IP, and only looked up if the IP still
+    has room: made-up tokens then share the IP's bucket and cannot make
+    the limiter query the database once that bucket is empty. A real
+    token pays this once per AUTH_TOKEN_CACHE_TTL, when its cache entry
+    is cold.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def take(self, key):
+        capacity = config.get_setting('RATE_LIMIT')
+        period = config.get_setting('RATE_LIMIT_PERIOD')
+        if config.get_setting('RATE_LIMIT_BACKEND') == 'cache':
+            return shared_allow(key, capacity, period)
+        return limiter.allow(key, capacity, period)
+
+    async def atake(self, key):
+        capacity = config.get_setting('RATE_LIMIT')
+        period = config.get_setting('RATE_LIMIT_PERIOD')
+        if config.get_setting('RATE_LIMIT_BACKEND') == 'cache':
+            return await ashared_allow(key, capacity, period)
+        return limiter.allow(key, capacity, period)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if config.get_setting('RATE_LIMIT'):
+            token = _request_token(request)
+            if token is None:
+                allowed, retry_after = self.take(client_key(request))
+            elif is_cached_token(token):
+                allowed, retry_after = self.take(_token_key(token))
+            else:
+                allowed, retry_after = self.take(_ip_key(request))
+                if allowed and token_is_valid(token):
+                    allowed, retry_after = self.take(_token_key(token))
+            if not allowed:
+                return rate_limited_response(retry_after)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        if config.get_setting('RATE_LIMIT'):
+            token = _request_token(request)
+            if token is None:
+                allowed, retry_after = await self.atake(await aclient_key(request))
+            elif await ais_cached_token(token):
+                allowed, retry_after = await self.atake(_token_key(token))
+            else:
+                allowed, retry_after = await self.atake(_ip_key(request))
+                if allowed and await aauthenticate_key(token) is not None:
+                    allowed, retry_after = await self.atake(_token_key(token))
+            if not allowed:
+                return rate_limited_response(retry_after)
+        return await self.get_response(request)
+
+class QueryTimer:
+    """execute_wrapper that counts queries and their total time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+def _install_timer(timer):
+    connection.execute_wrappers.append(timer)
+
+def _remove_timer(timer):
+    connection.execute_wrappers.remove(timer)
+
+class MetricsMiddleware:
+    """
+    Records wall time, query count, DB time and response size per resolved
+    URL name into posts.metrics.request_metrics. METRICS_SAMPLE_RATE picks
+    the fraction of requests measured; at 0 the middleware only does a
+    config lookup. Requests above METRICS_QUERY_THRESHOLD queries are
+    counted and logged so N+1 regressions show up.
+
+    Under ASGI it stays async. Connections are per thread and the async
+    ORM runs queries on the request's thread-sensitive sync thread, so the
+    query timer is installed on that thread's connection, not the event
+    loop's.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def sampled(self):
+        rate = config.get_setting('METRICS_SAMPLE_RATE')
+        return rate and (rate >= 1 or random.random() < rate)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        timer = QueryTimer()
+        start = time.perf_counter()
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        timer = QueryTimer()
+        start = time.perf_counter()
+        await sync_to_async(_install_timer)(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(_remove_timer)(timer)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    def record(self, request, response, duration, timer):
+        match = getattr(request, 'resolver_match', None)
+        view = (match.url_name or match.view_name) if match is not None else 'unmatched'
+        # Streaming bodies are produced after we return; their size is unknown here
+        size = None if response.streaming else len(response.content)
+        request_metrics.observe(view, duration, timer.count, timer.duration, size)
+
+        threshold = config.get_setting('METRICS_QUERY_THRESHOLD')
+        if threshold and timer.count > threshold:
+            request_metrics.flag(view, request.path, timer.count)
+            logger.warning("%s ran %d queries (threshold %d)", request.path, timer.count, threshold)
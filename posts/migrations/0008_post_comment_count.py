@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 03:30
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_comment_counts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    Comment = apps.get_model('posts', 'Comment')
+    counts = (
+        Comment.objects.filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(total=Count('id'))
+        .values('total')
+    )
+    Post.objects.update(
+        comment_count=Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_comment_post_created_id_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-comment_count', '-id'], name='post_comment_count_idx'),
+        ),
+        migrations.RunPython(backfill_comment_counts, migrations.RunPython.noop),
+    ]
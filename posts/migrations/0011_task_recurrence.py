@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:50
+
+import calendar
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def _next_occurrence(when, frequency):
+    if frequency == 'hourly':
+        return when + timedelta(hours=1)
+    if frequency == 'daily':
+        return when + timedelta(days=1)
+    if frequency == 'weekly':
+        return when + timedelta(weeks=1)
+    if frequency == 'monthly':
+        month = when.month % 12 + 1
+        year = when.year + (when.month == 12)
+        return when.replace(year=year, month=month, day=min(when.day, calendar.monthrange(year, month)[1]))
+    return None
+
+
+def schedule_existing_recurring_tasks(apps, schema_editor):
+    # Start existing recurring tasks at their next slot after now; no backfill
+    Task = apps.get_model('posts', 'Task')
+    now = timezone.now()
+    for task in Task.objects.filter(task_type='recurring').iterator():
+        frequency = str((task.metadata or {}).get('frequency', '')).lower()
+        next_run = _next_occurrence(task.created_at, frequency)
+        while next_run is not None and next_run <= now:
+            next_run = _next_occurrence(next_run, frequency)
+        if next_run is not None:
+            Task.objects.filter(pk=task.pk).update(next_run_at=next_run)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0010_task_assignee_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='next_run_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='occurrences', to='posts.task'),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='scheduled_for',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(condition=models.Q(('next_run_at__isnull', False)), fields=['next_run_at'], name='task_next_run_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('parent', 'scheduled_for'), name='unique_task_occurrence'),
+        ),
+        migrations.RunPython(schedule_existing_recurring_tasks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:30
+
+from django.db import migrations, models
+
+PRIORITY_LEVELS = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4}
+
+
+def backfill_priority_level(apps, schema_editor):
+    Task = apps.get_model('posts', 'Task')
+    ids_by_rank = {}
+    for task in Task.objects.filter(task_type='priority').only('id', 'metadata').iterator():
+        value = (task.metadata or {}).get('priority_level')
+        if isinstance(value, str):
+            rank = PRIORITY_LEVELS.get(value.lower())
+        elif isinstance(value, int) and value in PRIORITY_LEVELS.values():
+            rank = value
+        else:
+            rank = None
+        if rank is not None:
+            ids_by_rank.setdefault(rank, []).append(task.pk)
+    for rank, ids in ids_by_rank.items():
+        for start in range(0, len(ids), 500):
+            Task.objects.filter(pk__in=ids[start:start + 500]).update(priority_level=rank)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0011_task_recurrence'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='task',
+            name='priority_level',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', '-priority_level', 'created_at', 'id'], name='task_assignee_priority_idx'),
+        ),
+        migrations.RunPython(backfill_priority_level, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+from django.db import migrations
+
+# External-content FTS5 tables: the index stores only tokens and reads the
+# text back from the base table. Triggers keep it in step with every
+# INSERT/UPDATE/DELETE, including bulk_create and queryset.update().
+INDEXED_TABLES = ('posts_post', 'posts_comment')
+
+
+def index_statements(table):
+    fts = f'{table}_fts'
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5("
+        f"content, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, content) VALUES (new.id, new.content); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.id, old.content); END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF content ON {table} "
+        f"WHEN old.content IS NOT new.content BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, content) VALUES ('delete', old.id, old.content); "
+        f"INSERT INTO {fts}(rowid, content) VALUES (new.id, new.content); END",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in INDEXED_TABLES:
+        for statement in index_statements(table):
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for table in INDEXED_TABLES:
+        fts = f'{table}_fts'
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        schema_editor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0012_task_priority_level'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:20
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0014_follow_timeline'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('posts', 'Post'), ('comments', 'Comment'), ('tasks', 'Task')], max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('owner_id', models.BigIntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'ordering': ['deleted_at', 'id'],
+                'indexes': [models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_id_idx')],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['assigned_to', 'updated_at', 'id'], name='task_assignee_updated_idx'),
+        ),
+    ]
@@ -1,6 +1,7 @@
 # models.py
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 
 class Post(models.Model):
     content = models.TextField()
@@ -11,9 +12,18 @@ class Post(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Denormalized; kept in step by comment create/delete, see rebuild_comment_counts
+    comment_count = models.IntegerField(default=0)
 
     class Meta:
-        ordering = ['-created_at']  # Latest posts first
+        ordering = ['-created_at', '-id']  # Latest posts first
+        indexes = [
+            # Keyset pagination seeks on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='post_created_id_idx'),
+            models.Index(fields=['-comment_count', '-id'], name='post_comment_count_idx'),
+            # Exports and incremental reads walk (updated_at, id)
+            models.Index(fields=['updated_at', 'id'], name='post_updated_id_idx'),
+        ]
 
     def __str__(self):
         return self.content[:50]
@@ -34,7 +44,12 @@ class Comment(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # Per-post comment pages seek on (post, created_at, id)
+            models.Index(fields=['post', '-created_at', '-id'], name='comment_post_created_id_idx'),
+            models.Index(fields=['updated_at', 'id'], name='comment_updated_id_idx'),
+        ]
 
     def __str__(self):
         return f"Comment by {self.author.username} on Post {self.post.id}"
@@ -59,11 +74,128 @@ class Task(models.Model):
         default='regular'  # Add default
     )
     metadata = models.JSONField(null=True, blank=True)
+    # Priority tasks: metadata['priority_level'] as a sortable rank, see TaskFactory
+    priority_level = models.PositiveSmallIntegerField(null=True, blank=True)
+    # Recurring tasks: when the scheduler should materialize the next occurrence
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    # Occurrences: the recurring task they came from and the slot they fill
+    parent = models.ForeignKey(
+        'self',
+        related_name='occurrences',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True
+    )
+    scheduled_for = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        ordering = ['-created_at']  # Latest tasks first
+        ordering = ['-created_at', '-id']  # Latest tasks first
+        indexes = [
+            models.Index(fields=['updated_at', 'id'], name='task_updated_id_idx'),
+            # A user's task list pages on (created_at, id), optionally per type
+            models.Index(fields=['assigned_to', '-created_at', '-id'], name='task_assignee_created_idx'),
+            models.Index(fields=['assigned_to', 'task_type'], name='task_assignee_type_idx'),
+            # Delta sync reads one user's changes in (updated_at, id) order
+            models.Index(fields=['assigned_to', 'updated_at', 'id'], name='task_assignee_updated_idx'),
+            # "Next N tasks by priority" reads one range of this index
+            models.Index(
+                fields=['assigned_to', '-priority_level', 'created_at', 'id'],
+                name='task_assignee_priority_idx'
+            ),
+            # Only recurring tasks carry next_run_at, so keep the index to them
+            models.Index(
+                fields=['next_run_at'],
+                name='task_next_run_idx',
+                condition=models.Q(next_run_at__isnull=False)
+            ),
+        ]
+        constraints = [
+            # Makes materialization idempotent across concurrent scheduler ticks
+            models.UniqueConstraint(fields=['parent', 'scheduled_for'], name='unique_task_occurrence'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='following',
+        on_delete=models.CASCADE,
+        db_index=False  # Covered by unique_follow
+    )
+    followee = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='followers',
+        on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['follower', 'followee'], name='unique_follow'),
+        ]
+
+    def __str__(self):
+        return f'{self.follower_id} -> {self.followee_id}'
+
+class TimelineEntry(models.Model):
+    """
+    One post in one user's home timeline, written at post time (fan-out on
+    write). created_at copies the post's so the timeline sorts like the feed.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='timeline',
+        on_delete=models.CASCADE,
+        db_index=False  # Covered by timeline_user_created_idx
+    )
+    post = models.ForeignKey(Post, related_name='timeline_entries', on_delete=models.CASCADE)
+    # Denormalized so unfollowing can drop an author's entries without a join
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name='+',
+        on_delete=models.CASCADE,
+        db_index=False
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # A user's timeline page is one range of this index
+            models.Index(fields=['user', '-created_at', '-id'], name='timeline_user_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_timeline_entry'),
+        ]
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted post, comment or task, written by the post_delete
+    handlers in posts.signals so delta sync can report deletions.
+    """
+    KINDS = [
+        ('posts', 'Post'),
+        ('comments', 'Comment'),
+        ('tasks', 'Task'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KINDS)
+    object_id = models.BigIntegerField()
+    # Tasks are private to their assignee; None means visible to everyone.
+    # A plain column rather than a foreign key: the owner may be the user
+    # whose deletion cascaded here
+    owner_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['deleted_at', 'id'], name='tombstone_deleted_id_idx'),
+        ]
 
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f'{self.kind}:{self.object_id}'
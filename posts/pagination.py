@@ -0,0 +1,182 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from singletons.config_manager import ConfigManager
+
+config = ConfigManager()
+
+def seek_filter(ordering, position):
+    """
+    Build the lexicographic "row comes after position" filter, e.g. for
+    ('-created_at', '-id'): created_at < x OR (created_at = x AND id < y).
+    """
+    condition = Q()
+    equal = Q()
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = 'lt' if field.startswith('-') else 'gt'
+        condition |= equal & Q(**{f'{name}__{lookup}': value})
+        equal &= Q(**{name: value})
+    # Redundant bound on the leading column turns the OR into a range scan
+    first, value = ordering[0], position[0]
+    lookup = 'lte' if first.startswith('-') else 'gte'
+    return Q(**{f'{first.lstrip("-")}__{lookup}': value}) & condition
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks on a unique ordering, e.g. (created_at, id).
+
+    Every page is a single range scan on the matching index, so deep pages
+    cost the same as the first one. Cursors are opaque to clients.
+    """
+    ordering = ('-created_at', '-id')
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    def get_page_size(self, request):
+        page_size = config.get_setting('PAGE_SIZE')
+        max_page_size = config.get_setting('MAX_PAGE_SIZE')
+        value = request.GET.get(self.page_size_query_param)
+        if value is not None:
+            try:
+                page_size = int(value)
+            except ValueError:
+                pass
+        return max(1, min(page_size, max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare_queryset(queryset, request)
+        return self.finish_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        queryset = self.prepare_queryset(queryset, request)
+        return self.finish_page([obj async for obj in queryset])
+
+    def prepare_queryset(self, queryset, request):
+        """Apply the cursor and return the (unevaluated) slice for this page."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.position, self.reverse = self.decode_cursor(request)
+
+        ordering = self.ordering
+        if self.reverse:
+            ordering = tuple(self._invert(field) for field in ordering)
+        if self.position is not None:
+            queryset = queryset.filter(seek_filter(ordering, self.position))
+        # Fetch one extra row to know whether another page exists
+        return queryset.order_by(*ordering)[:self.page_size + 1]
+
+    def finish_page(self, results):
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if self.reverse:
+            results.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+        self.page = results
+        return results
+
+    def get_paginated_data(self, data):
+        return {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    # Cursor encoding
+
+    def encode_cursor(self, position, reverse):
+        payload = json.dumps({'p': position, 'r': int(reverse)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.GET.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            raw_position = payload['p']
+            reverse = bool(payload.get('r', 0))
+            if len(raw_position) != len(self.ordering):
+                raise ValueError
+            position = [self.to_python(name, value) for name, value in zip(self._field_names(), raw_position)]
+            for value in position:
+                # seek_filter cannot compare with NULL, and naive datetimes are ambiguous
+                if value is None or (isinstance(value, datetime) and timezone.is_naive(value)):
+                    raise ValueError
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def to_python(self, name, value):
+        """Turn a cursor value back into the type of its ordering column."""
+        return self._field(name).to_python(value)
+
+    # Helpers
+
+    def _field_names(self):
+        return [field.lstrip('-') for field in self.ordering]
+
+    def _field(self, name):
+        if name == 'pk':
+            return self.model._meta.pk
+        return self.model._meta.get_field(name)
+
+    def _position(self, item):
+        position = []
+        for name in self._field_names():
+            value = item[name] if isinstance(item, dict) else getattr(item, name)
+            # Keep full precision; DjangoJSONEncoder would drop microseconds
+            position.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        return position
+
+    def _link(self, item, reverse):
+        url = self.request.build_absolute_uri()
+        cursor = self.encode_cursor(self._position(item), reverse)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    @staticmethod
+    def _invert(field):
+        return field[1:] if field.startswith('-') else '-' + field
@@ -1,4 +1,45 @@
+import uuid
+from django.core.cache import cache
 from rest_framework.permissions import BasePermission, SAFE_METHODS
+from singletons.config_manager import ConfigManager
+
+config = ConfigManager()
+
+def _role_version_key(user_id):
+    return f'roles:version:{user_id}'
+
+def bump_role_version(user_id):
+    """Invalidate cached roles; call after changing a user's groups."""
+    cache.set(_role_version_key(user_id), uuid.uuid4().hex, None)
+
+def _role_version(user_id):
+    key = _role_version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+def get_user_roles(request):
+    """
+    Group names of request.user, resolved once per request and cached per
+    user under a version stamp that bump_role_version replaces.
+    """
+    roles = getattr(request, '_user_roles', None)
+    if roles is not None:
+        return roles
+
+    user = request.user
+    if not user or not user.is_authenticated:
+        roles = frozenset()
+    else:
+        key = f'roles:{user.pk}:{_role_version(user.pk)}'
+        roles = cache.get(key)
+        if roles is None:
+            roles = frozenset(user.groups.values_list('name', flat=True))
+            cache.set(key, roles, config.get_setting('ROLE_CACHE_TIMEOUT'))
+    request._user_roles = roles
+    return roles
 
 class IsPostAuthor(BasePermission):
     def has_object_permission(self, request, view, obj):
@@ -16,4 +57,4 @@ class IsAdminUser(BasePermission):
 
 class IsModeratorUser(BasePermission):
     def has_permission(self, request, view):
-        return request.user and request.user.groups.filter(name='Moderator').exists()
\ No newline at end of file
+        return request.user and 'Moderator' in get_user_roles(request)
@@ -0,0 +1,85 @@
+import calendar
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Case, DateTimeField, F, Value, When
+from django.utils import timezone
+from .models import Task
+
+FREQUENCIES = ('hourly', 'daily', 'weekly', 'monthly')
+
+def _add_months(when, months):
+    month = when.month - 1 + months
+    year = when.year + month // 12
+    month = month % 12 + 1
+    day = min(when.day, calendar.monthrange(year, month)[1])
+    return when.replace(year=year, month=month, day=day)
+
+def next_occurrence(when, frequency):
+    frequency = str(frequency).lower()
+    if frequency == 'hourly':
+        return when + timedelta(hours=1)
+    if frequency == 'daily':
+        return when + timedelta(days=1)
+    if frequency == 'weekly':
+        return when + timedelta(weeks=1)
+    if frequency == 'monthly':
+        return _add_months(when, 1)
+    raise ValueError(f"Unsupported frequency '{frequency}'")
+
+def tick(now=None, batch_size=500, max_catch_up=100):
+    """
+    Materialize every occurrence that is due by `now` and return the
+    number of slots processed.
+
+    Due tasks are found through the partial index on next_run_at. Each
+    batch is inserted with one bulk_create, and next_run_at is advanced
+    with one compare-and-set UPDATE. The (parent, scheduled_for)
+    constraint makes concurrent ticks safe: a slot is filled at most once.
+    """
+    now = now or timezone.now()
+    created = 0
+    while True:
+        due = list(
+            Task.objects.filter(next_run_at__lte=now)
+            .order_by('next_run_at', 'id')[:batch_size]
+        )
+        if not due:
+            return created
+
+        occurrences = []
+        advanced = {}
+        for task in due:
+            slot = task.next_run_at
+            frequency = (task.metadata or {}).get('frequency')
+            for _ in range(max_catch_up):
+                if slot > now:
+                    break
+                occurrences.append(Task(
+                    title=task.title,
+                    description=task.description,
+                    assigned_to_id=task.assigned_to_id,
+                    task_type='regular',
+                    parent=task,
+                    scheduled_for=slot,
+                ))
+                try:
+                    slot = next_occurrence(slot, frequency)
+                except ValueError:
+                    slot = None
+                    break
+            advanced[task.pk] = (task.next_run_at, slot)
+
+        with transaction.atomic():
+            Task.objects.bulk_create(occurrences, ignore_conflicts=True)
+            # Only move next_run_at if no other tick has moved it meanwhile
+            Task.objects.filter(pk__in=advanced).update(next_run_at=Case(
+                *[
+                    When(pk=pk, next_run_at=old, then=Value(new))
+                    for pk, (old, new) in advanced.items()
+                ],
+                default=F('next_run_at'),
+                output_field=DateTimeField(),
+            ))
+        created += len(occurrences)
+        if len(due) < batch_size:
+            return created
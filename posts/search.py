@@ -0,0 +1,112 @@
+import html
+import re
+from django.db import connection
+from .models import Post, Comment
+from .pagination import KeysetPagination
+
+# Index tables created by migration 0013 (SQLite only)
+SEARCH_INDEXES = {
+    'posts': (Post, 'posts_post_fts'),
+    'comments': (Comment, 'posts_comment_fts'),
+}
+
+# snippet() wraps matches in control characters, which cannot occur in the
+# escaped text, so they can be swapped for <mark> after escaping
+MATCH_START, MATCH_END = '\x02', '\x03'
+SNIPPET_TOKENS = 24
+
+def search_available():
+    return connection.vendor == 'sqlite'
+
+def build_match(query):
+    """
+    Turn free text into an FTS5 query: every word becomes a quoted term and
+    all of them must match, so user input can never be a syntax error.
+    """
+    terms = re.findall(r'\w+', query or '')
+    return ' '.join(f'"{term}"' for term in terms)
+
+def highlight(text):
+    return (
+        html.escape(text)
+        .replace(MATCH_START, '<mark>')
+        .replace(MATCH_END, '</mark>')
+    )
+
+def search_page(kind, match, position=None, reverse=False, limit=20):
+    """
+    One page of (id, rank) rows for match, best first. bm25 ranks are
+    negative, lower is better; ties are broken on id so the order is total
+    and (rank, id) can serve as a keyset cursor.
+    """
+    _, table = SEARCH_INDEXES[kind]
+    op, direction = ('<', 'DESC') if reverse else ('>', 'ASC')
+    sql = f'SELECT id, rank FROM (SELECT rowid AS id, rank FROM {table} WHERE {table} MATCH %s)'
+    params = [match]
+    if position is not None:
+        sql += f' WHERE rank {op} %s OR (rank = %s AND id {op} %s)'
+        params += [position[0], position[0], position[1]]
+    sql += f' ORDER BY rank {direction}, id {direction} LIMIT %s'
+    params.append(limit)
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [{'id': row[0], 'rank': row[1]} for row in cursor.fetchall()]
+
+def attach_results(kind, match, rows):
+    """Add highlighted snippets and the matching objects to a page of rows."""
+    if not rows:
+        return rows
+    model, table = SEARCH_INDEXES[kind]
+    ids = [row['id'] for row in rows]
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid, snippet({table}, 0, %s, %s, '…', %s) FROM {table} "
+            f'WHERE {table} MATCH %s AND rowid IN ({placeholders})',
+            [MATCH_START, MATCH_END, SNIPPET_TOKENS, match, *ids],
+        )
+        snippets = dict(cursor.fetchall())
+    objects = model.objects.select_related('author').in_bulk(ids)
+    results = []
+    for row in rows:
+        obj = objects.get(row['id'])
+        if obj is None:
+            # Deleted between the two queries
+            continue
+        result = {
+            'id': obj.id,
+            'rank': row['rank'],
+            'highlight': highlight(snippets.get(obj.id, '')),
+            'author': obj.author.username,
+            'created_at': obj.created_at,
+        }
+        if kind == 'posts':
+            result['comments_count'] = obj.comment_count
+        else:
+            result['post'] = obj.post_id
+        results.append(result)
+    return results
+
+def rebuild_index(kinds=None, optimize=False):
+    """Re-read every row from the base tables; use after loading data with triggers off."""
+    with connection.cursor() as cursor:
+        for kind in kinds or SEARCH_INDEXES:
+            _, table = SEARCH_INDEXES[kind]
+            cursor.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+            if optimize:
+                # Merge all b-tree segments into one for the fastest reads
+                cursor.execute(f"INSERT INTO {table}({table}) VALUES ('optimize')")
+
+class SearchPagination(KeysetPagination):
+    """Keyset pages over FTS5 results, seeking on (rank, id)."""
+    ordering = ('rank', 'id')
+
+    def to_python(self, name, value):
+        return float(value) if name == 'rank' else int(value)
+
+    def paginate_search(self, kind, match, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.position, self.reverse = self.decode_cursor(request)
+        rows = search_page(kind, match, self.position, self.reverse, self.page_size + 1)
+        return self.finish_page(rows)
@@ -0,0 +1,175 @@
+import random
+from array import array
+from contextlib import contextmanager
+from itertools import accumulate
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from rest_framework.authtoken.models import Token
+from factories.task_factory import TaskFactory
+from .models import Post, Comment, Task
+
+TASK_TYPES = ('regular', 'priority', 'recurring')
+TASK_FREQUENCIES = ('daily', 'weekly', 'monthly')
+SYLLABLES = ('ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'ze', 'pa', 'da', 'fi', 'go', 'hu', 'be', 'tor')
+VOCABULARY_SIZE = 5000
+
+@contextmanager
+def fast_load():
+    """
+    Trade durability for insert speed while loading synthetic data. On
+    SQLite the journal and fsyncs are relaxed for this connection and
+    restored afterwards; on PostgreSQL commits stop waiting for the WAL.
+    Inside an outer transaction nothing is changed.
+    """
+    # SQLite refuses to change these settings mid-transaction
+    vendor = None if connection.in_atomic_block else connection.vendor
+    with connection.cursor() as cursor:
+        if vendor == 'sqlite':
+            saved = {}
+            for pragma in ('synchronous', 'journal_mode', 'cache_size', 'temp_store'):
+                cursor.execute(f'PRAGMA {pragma}')
+                saved[pragma] = cursor.fetchone()[0]
+            cursor.execute('PRAGMA synchronous = OFF')
+            cursor.execute('PRAGMA journal_mode = MEMORY')
+            cursor.execute('PRAGMA cache_size = -262144')
+            cursor.execute('PRAGMA temp_store = MEMORY')
+        elif vendor == 'postgresql':
+            cursor.execute('SET synchronous_commit TO OFF')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            if vendor == 'sqlite':
+                for pragma, value in saved.items():
+                    cursor.execute(f'PRAGMA {pragma} = {value}')
+            elif vendor == 'postgresql':
+                cursor.execute('RESET synchronous_commit')
+
+class Seeder:
+    """
+    Deterministic bulk loader for users, tokens, posts, comments and tasks.
+
+    Rows are generated and inserted batch by batch, so memory stays flat
+    however many are requested. Comments per post follow a Pareto
+    distribution (lower comment_alpha means a heavier tail) and each
+    post's comment_count is written with the post itself.
+    """
+
+    def __init__(self, seed=0, batch_size=5000, comment_alpha=1.2, task_mix=(6, 3, 1),
+                 priority_mix=(1, 1, 1, 1), password='SeedUser123!', prefix='seed_user_', progress=None):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.comment_alpha = comment_alpha
+        self.task_mix = task_mix
+        self.priority_mix = priority_mix
+        self.password = password
+        self.prefix = prefix
+        self.progress = progress or (lambda message: None)
+        # Synthetic words drawn with Zipf frequencies, so text search sees
+        # a few very common terms and a long tail of rare ones
+        self.words = sorted({
+            ''.join(self.rng.choices(SYLLABLES, k=self.rng.randint(2, 4))) for _ in range(VOCABULARY_SIZE)
+        })
+        self.rng.shuffle(self.words)
+        self.word_weights = list(accumulate(1 / rank for rank in range(1, len(self.words) + 1)))
+
+    def text(self, low=6, high=40):
+        return ' '.join(self.rng.choices(self.words, cum_weights=self.word_weights, k=self.rng.randint(low, high)))
+
+    def _inserted_ids(self, model, objs):
+        if objs and objs[0].pk is None:
+            # Backends that cannot return ids from a bulk insert
+            ids = model.objects.order_by('-pk').values_list('pk', flat=True)[:len(objs)]
+            for obj, pk in zip(objs, reversed(list(ids))):
+                obj.pk = pk
+        return [obj.pk for obj in objs]
+
+    def users(self, count):
+        # One hash for everybody; hashing per user would dominate the load
+        password = make_password(self.password)
+        user_ids = []
+        for start in range(0, count, self.batch_size):
+            with transaction.atomic():
+                users = User.objects.bulk_create([
+                    User(username=f'{self.prefix}{i}', password=password)
+                    for i in range(start, min(start + self.batch_size, count))
+                ])
+                ids = self._inserted_ids(User, users)
+                Token.objects.bulk_create([Token(user_id=pk, key=Token.generate_key()) for pk in ids])
+            user_ids.extend(ids)
+            self.progress(f'users: {len(user_ids)}/{count}')
+        return user_ids
+
+    def comment_counts(self, posts, comments):
+        """Split comments over posts in proportion to Pareto weights."""
+        rng = self.rng
+        weights = array('d', (rng.paretovariate(self.comment_alpha) for _ in range(posts)))
+        total = sum(weights)
+        counts = array('l', (int(comments * weight / total) for weight in weights))
+        remainder = comments - sum(counts)
+        if remainder:
+            for index in rng.choices(range(posts), cum_weights=list(accumulate(weights)), k=remainder):
+                counts[index] += 1
+        return counts
+
+    def posts_and_comments(self, posts, comments, user_ids):
+        if not posts:
+            return
+        rng = self.rng
+        counts = self.comment_counts(posts, comments)
+        pending = []
+        written = 0
+        for start in range(0, posts, self.batch_size):
+            stop = min(start + self.batch_size, posts)
+            with transaction.atomic():
+                created = Post.objects.bulk_create([
+                    Post(content=self.text(), author_id=rng.choice(user_ids), comment_count=counts[i])
+                    for i in range(start, stop)
+                ])
+                for index, post_id in zip(range(start, stop), self._inserted_ids(Post, created)):
+                    for _ in range(counts[index]):
+                        pending.append(Comment(
+                            content=self.text(3, 20),
+                            author_id=rng.choice(user_ids),
+                            post_id=post_id,
+                        ))
+                        if len(pending) >= self.batch_size:
+                            Comment.objects.bulk_create(pending)
+                            written += len(pending)
+                            pending = []
+                if stop == posts and pending:
+                    Comment.objects.bulk_create(pending)
+                    written += len(pending)
+                    pending = []
+            self.progress(f'posts: {stop}/{posts}, comments: {written}/{comments}')
+
+    def tasks(self, count, user_ids):
+        rng = self.rng
+        levels = list(TaskFactory.PRIORITY_LEVELS)
+        for start in range(0, count, self.batch_size):
+            stop = min(start + self.batch_size, count)
+            batch = []
+            for i in range(start, stop):
+                task_type = rng.choices(TASK_TYPES, weights=self.task_mix)[0]
+                if task_type == 'priority':
+                    metadata = {'priority_level': rng.choices(levels, weights=self.priority_mix)[0]}
+                elif task_type == 'recurring':
+                    metadata = {'frequency': rng.choice(TASK_FREQUENCIES)}
+                else:
+                    metadata = {}
+                # build_task validates and fills priority_level and next_run_at
+                task = TaskFactory.build_task(task_type, f'Task {i}', '', None, metadata)
+                task.assigned_to_id = rng.choice(user_ids)
+                batch.append(task)
+            with transaction.atomic():
+                Task.objects.bulk_create(batch)
+            self.progress(f'tasks: {stop}/{count}')
+
+    def run(self, users, posts, comments, tasks):
+        """Seed everything and return the new user ids in creation order."""
+        user_ids = self.users(users)
+        if user_ids:
+            self.posts_and_comments(posts, comments, user_ids)
+            self.tasks(tasks, user_ids)
+        return user_ids
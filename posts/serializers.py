@@ -1,9 +1,41 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Post, Comment
+from django.db import transaction
+from django.utils import timezone
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+from .models import Post, Comment, Task
 
 User = get_user_model()
 
+def parse_fields(value, allowed):
+    """
+    Parse a ?fields=a,b projection against the allowed field names. Returns
+    None when no projection was asked for; 'id' is always kept because
+    keyset cursors are built from it.
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise serializers.ValidationError({'fields': f"Unknown fields: {', '.join(sorted(unknown))}"})
+    requested.add('id')
+    return [name for name in allowed if name in requested]
+
+class SparseFieldsMixin:
+    """Drop every field not named in the request's ?fields= parameter."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+        requested = parse_fields(request.GET.get('fields'), list(self.fields))
+        if requested is not None:
+            for name in set(self.fields) - set(requested):
+                self.fields.pop(name)
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -21,7 +53,13 @@ class CommentSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         author = self.context['request'].user
         validated_data['author'] = author
-        return Comment.objects.create(**validated_data)
+        with transaction.atomic():
+            comment = Comment.objects.create(**validated_data)
+            # updated_at moves too: the post's ETag covers its embedded comments
+            Post.objects.filter(pk=comment.post_id).update(
+                comment_count=F('comment_count') + 1, updated_at=timezone.now()
+            )
+        return comment
 
     def update(self, instance, validated_data):
         instance.content = validated_data.get('content', instance.content)
@@ -33,18 +71,49 @@ class CommentSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("Post not found.")
         return value
 
+class BulkCommentSerializer(CommentSerializer):
+    # Posts are resolved for the whole batch at once by the view
+    post = serializers.IntegerField(source='post_id')
+
+    def validate_post(self, value):
+        return value
+
 class PostSerializer(serializers.ModelSerializer):
     author = serializers.ReadOnlyField(source='author.username')
     comments = CommentSerializer(many=True, read_only=True)
-    comments_count = serializers.SerializerMethodField()
+    comments_count = serializers.IntegerField(source='comment_count', read_only=True)
 
     class Meta:
         model = Post
         fields = ['id', 'content', 'author', 'created_at', 'updated_at', 'comments', 'comments_count']
         read_only_fields = ['author', 'created_at', 'updated_at']
 
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+    @staticmethod
+    def setup_eager_loading(queryset, comments_limit=None):
+        """
+        Load everything the serializer touches in a fixed number of queries.
+
+        With comments_limit only the newest N comments of each post are
+        embedded, ranked with a ROW_NUMBER() window so the whole page is
+        still a single comment query.
+        """
+        return queryset.select_related('author').prefetch_related(
+            Prefetch('comments', queryset=PostSerializer.comments_queryset(comments_limit))
+        )
+
+    @staticmethod
+    def comments_queryset(comments_limit=None):
+        """The comments to prefetch for a page of posts, see setup_eager_loading."""
+        comments = Comment.objects.select_related('author')
+        if comments_limit is not None:
+            comments = comments.annotate(
+                recent_rank=Window(
+                    RowNumber(),
+                    partition_by=F('post_id'),
+                    order_by=[F('created_at').desc(), F('id').desc()],
+                )
+            ).filter(recent_rank__lte=comments_limit)
+        return comments
 
     def create(self, validated_data):
         author = self.context['request'].user
@@ -60,4 +129,13 @@ class PostDetailSerializer(PostSerializer):
     comments = CommentSerializer(many=True, read_only=True)
 
     class Meta(PostSerializer.Meta):
-        fields = PostSerializer.Meta.fields + ['comments']
\ No newline at end of file
+        fields = PostSerializer.Meta.fields + ['comments']
+
+class TaskSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Task
+        fields = [
+            'id', 'title', 'description', 'task_type', 'metadata', 'priority_level',
+            'next_run_at', 'parent', 'scheduled_for', 'created_at'
+        ]
+        read_only_fields = fields
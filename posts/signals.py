@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .cache import invalidate_detail
+from .models import Post, Comment, Task, Tombstone
+
+# post_delete fires for every row a delete removes, including cascades from
+# user.delete() and queryset.delete(), and runs inside the same transaction
+
+def drop_cached(model, *pks):
+    """Invalidate detail cache entries from every write path, cascades included."""
+    invalidate_detail(model, *pks)
+    if transaction.get_connection().in_atomic_block:
+        # A concurrent reader may cache the old row again before we commit
+        transaction.on_commit(lambda: invalidate_detail(model, *pks))
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, **kwargs):
+    # A new row has nothing cached yet
+    if not created:
+        drop_cached(Post, instance.pk)
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, **kwargs):
+    if not created:
+        drop_cached(Comment, instance.pk)
+    # The parent post embeds its comments
+    drop_cached(Post, instance.post_id)
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    Tombstone.objects.create(kind='posts', object_id=instance.pk)
+    drop_cached(Post, instance.pk)
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    Tombstone.objects.create(kind='comments', object_id=instance.pk)
+    # Here rather than in the view, so cascades (e.g. deleting a commenter)
+    # keep the counter in step too; updated_at moves as the post embeds comments
+    Post.objects.filter(pk=instance.post_id).update(
+        comment_count=F('comment_count') - 1, updated_at=timezone.now()
+    )
+    drop_cached(Comment, instance.pk)
+    drop_cached(Post, instance.post_id)
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, **kwargs):
+    Tombstone.objects.create(kind='tasks', object_id=instance.pk, owner_id=instance.assigned_to_id)
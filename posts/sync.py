@@ -0,0 +1,157 @@
+import base64
+import binascii
+import json
+from datetime import datetime, timedelta
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, Q
+from django.utils import timezone
+from rest_framework.exceptions import APIException, NotFound
+from singletons.config_manager import ConfigManager
+from .export import EXPORTS
+from .models import Task, Tombstone
+from .pagination import seek_filter
+
+config = ConfigManager()
+
+SYNC_KINDS = ('posts', 'comments', 'tasks')
+CHANGE_ORDERING = ('updated_at', 'id')
+TOMBSTONE_ORDERING = ('deleted_at', 'id')
+
+class CursorExpired(APIException):
+    status_code = 410
+    default_detail = 'Sync cursor is older than the tombstone retention; sync from scratch.'
+    default_code = 'cursor_expired'
+
+def encode_cursor(positions):
+    payload = {
+        key: None if position is None else [position[0].isoformat(), position[1]]
+        for key, position in positions.items()
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(encoded):
+    """Cursor -> {'posts': (updated_at, id) or None, ..., 'deleted': (deleted_at, id) or None}."""
+    try:
+        padded = encoded + '=' * (-len(encoded) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+        positions = {}
+        for key in (*SYNC_KINDS, 'deleted'):
+            value = payload[key]
+            if value is None:
+                # Only change streams can be unstarted; deletions always have a position
+                if key == 'deleted':
+                    raise ValueError
+                positions[key] = None
+                continue
+            moment = datetime.fromisoformat(value[0])
+            if timezone.is_naive(moment):
+                raise ValueError
+            positions[key] = (moment, int(value[1]))
+    except (TypeError, ValueError, KeyError, IndexError, AttributeError, binascii.Error):
+        raise NotFound('Invalid cursor')
+    return positions
+
+def changes(kind, user, position):
+    """Rows of kind changed after position, in (updated_at, id) order."""
+    model, fields = EXPORTS[kind]
+    queryset = model.objects.all()
+    if model is Task:
+        queryset = queryset.filter(assigned_to=user)
+    if position is not None:
+        queryset = queryset.filter(seek_filter(CHANGE_ORDERING, position))
+    return queryset.order_by(*CHANGE_ORDERING).values(*fields)
+
+def tombstones(user, position):
+    queryset = Tombstone.objects.filter(Q(owner_id__isnull=True) | Q(owner_id=user.pk))
+    if position is not None:
+        queryset = queryset.filter(seek_filter(TOMBSTONE_ORDERING, position))
+    return queryset.order_by(*TOMBSTONE_ORDERING).values('id', 'kind', 'object_id', 'deleted_at')
+
+def pending(user, positions):
+    """
+    Which streams have anything after the cursor, as one query of EXISTS
+    index probes; an up-to-date client stops here.
+    """
+    probes = {f'pending_{kind}': Exists(changes(kind, user, positions[kind])) for kind in SYNC_KINDS}
+    probes['pending_deleted'] = Exists(tombstones(user, positions['deleted']))
+    flags = get_user_model().objects.filter(pk=user.pk).values(**probes).first() or {}
+    return {key.removeprefix('pending_'): value for key, value in flags.items()}
+
+def settle_horizon():
+    return timezone.now() - timedelta(seconds=config.get_setting('SYNC_SETTLE_SECONDS'))
+
+def settle(position, was):
+    """
+    Keep the cursor SYNC_SETTLE_SECONDS behind now. A transaction that
+    started earlier may still commit rows stamped before the newest row we
+    saw; re-reading that short window means such rows are not skipped.
+    Clients apply changes idempotently, so the overlap is harmless.
+    """
+    horizon = settle_horizon()
+    if position is None or position[0] <= horizon:
+        return position
+    if was is not None and was[0] > horizon:
+        return was
+    return (horizon, 0)
+
+def advance(rows, limit, column, was):
+    """
+    New cursor position after reading rows (limit + 1 were asked for) and
+    whether to page on. The rows may be gone by now if they were deleted
+    after the pending() probe.
+    """
+    if not rows:
+        return was, False
+    page = rows[:limit]
+    last = (page[-1][column], page[-1]['id'])
+    position = settle(last, was)
+    # Held back at the horizon, the next page would only repeat unsettled
+    # rows, so stop paging until they settle
+    return position, len(rows) > limit and position == last
+
+def initial_positions():
+    # A fresh client loads current rows; deletions before now don't concern it
+    return {**{kind: None for kind in SYNC_KINDS}, 'deleted': (settle_horizon(), 0)}
+
+def sync(user, cursor, limit):
+    """
+    One round of delta sync: up to limit changed rows per kind and limit
+    tombstones after the cursor. Call again with the returned cursor while
+    has_more is true.
+    """
+    positions = decode_cursor(cursor) if cursor else initial_positions()
+    deleted_position = positions['deleted']
+    retention = timedelta(days=config.get_setting('TOMBSTONE_RETENTION_DAYS'))
+    if deleted_position[0] < timezone.now() - retention:
+        raise CursorExpired()
+
+    flags = pending(user, positions)
+    result = {'changes': {kind: [] for kind in SYNC_KINDS}, 'deleted': {kind: [] for kind in SYNC_KINDS}}
+    has_more = False
+    new_positions = dict(positions)
+
+    for kind in SYNC_KINDS:
+        if not flags.get(kind):
+            continue
+        rows = list(changes(kind, user, positions[kind])[:limit + 1])
+        new_positions[kind], more = advance(rows, limit, 'updated_at', positions[kind])
+        has_more = has_more or more
+        result['changes'][kind] = rows[:limit]
+
+    if not flags.get('deleted'):
+        # Nothing was deleted since the cursor, so move it up to the horizon;
+        # otherwise a client would expire just because nobody deleted anything
+        horizon = settle_horizon()
+        if deleted_position[0] < horizon:
+            new_positions['deleted'] = (horizon, 0)
+    else:
+        rows = list(tombstones(user, deleted_position)[:limit + 1])
+        new_positions['deleted'], more = advance(rows, limit, 'deleted_at', deleted_position)
+        has_more = has_more or more
+        for row in rows[:limit]:
+            result['deleted'][row['kind']].append(row['object_id'])
+
+    result['cursor'] = encode_cursor(new_positions)
+    result['has_more'] = has_more
+    return result
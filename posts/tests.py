@@ -1,10 +1,43 @@
 from django.test import TestCase, Client
 from django.urls import reverse
 from django.contrib.auth.models import User, Group
-from rest_framework.test import APIClient
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
 from rest_framework.authtoken.models import Token
-from .models import Post
+from .models import Post, Comment, Task, Follow
+from .pagination import KeysetPagination
+from .sync import advance, decode_cursor, encode_cursor
+from .views import UserListCreate
+from singletons.config_manager import ConfigManager
+from .cache import stats as detail_cache_stats
+from .authentication import token_cache
+from .checks import check_shared_cache
+from .permissions import IsModeratorUser
+from . import scheduler, timeline
+from .middleware import MetricsMiddleware, RateLimitMiddleware, TokenBucketLimiter, limiter
+from .metrics import request_metrics
+from .benchmarking import seed_dataset
+from .hashing import HashingBusy, HashingGate, password_hashing
+from singletons.logger_singleton import DroppingQueueHandler, JsonFormatter
+from factories.task_factory import TaskFactory
+import base64
 import json
+from asgiref.sync import iscoroutinefunction
+import logging
+import queue
+from datetime import timedelta
+from django.utils import timezone
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+def authenticated_client(username, **extra):
+    """Create a user with an API token; return (user, token, client sending the token)."""
+    user = User.objects.create_user(username=username, password='TestPassword123!', **extra)
+    token = Token.objects.create(user=user)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return user, token, client
 
 class SecurityTestCase(TestCase):
     def setUp(self):
@@ -138,4 +171,1029 @@ class SecurityTestCase(TestCase):
         
         # Try to access protected endpoint with invalidated token
         response = self.client.get(reverse('get_posts'))
-        self.assertEqual(response.status_code, 401)
\ No newline at end of file
+        self.assertEqual(response.status_code, 401)
+
+class PostFeedPaginationTestCase(TestCase):
+    def setUp(self):
+        self.user, self.token, self.client = authenticated_client('feed_user')
+        for i in range(5):
+            Post.objects.create(content=f'Post {i}', author=self.user)
+
+    def get_feed(self, url=None, **params):
+        return self.client.get(url or reverse('post-list-create'), params, secure=True)
+
+    def test_keyset_pages_cover_feed_once(self):
+        """Test that walking next cursors returns every post exactly once, newest first"""
+        response = self.get_feed(page_size=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.data['previous'])
+        ids = [post['id'] for post in response.data['results']]
+        while response.data['next']:
+            response = self.get_feed(response.data['next'])
+            ids += [post['id'] for post in response.data['results']]
+        expected = list(Post.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_previous_cursor_returns_prior_page(self):
+        """Test that the previous cursor walks back to the same page"""
+        first = self.get_feed(page_size=2)
+        second = self.get_feed(first.data['next'])
+        back = self.get_feed(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+
+    def test_page_size_is_capped(self):
+        """Test that page_size cannot exceed MAX_PAGE_SIZE"""
+        config = ConfigManager()
+        original = config.get_setting('MAX_PAGE_SIZE')
+        config.set_setting('MAX_PAGE_SIZE', 3)
+        try:
+            response = self.get_feed(page_size=1000)
+        finally:
+            config.set_setting('MAX_PAGE_SIZE', original)
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_invalid_cursor(self):
+        """Test that a tampered cursor is rejected"""
+        response = self.get_feed(cursor='not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+
+    def test_cursor_with_nulls_or_naive_datetimes(self):
+        """Test that cursors which decode to NULL or naive positions are rejected, not a 500"""
+        paginator = KeysetPagination()
+        for position in ([None, None], ['2020-01-01T00:00:00+00:00', None], ['2020-01-01T00:00:00', 1]):
+            cursor = paginator.encode_cursor(position, False)
+            self.assertEqual(self.get_feed(cursor=cursor).status_code, 404)
+            self.assertEqual(self.client.get(reverse('task_list'), {'cursor': cursor}, secure=True).status_code, 404)
+
+
+class PostQueryCountTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user, self.token, self.client = authenticated_client('query_user')
+
+    def create_posts(self, count):
+        for i in range(count):
+            commenter = User.objects.create_user(username=f'commenter_{count}_{i}')
+            post = Post.objects.create(content=f'Post {i}', author=self.user)
+            Comment.objects.create(content='First', author=commenter, post=post)
+            Comment.objects.create(content='Second', author=self.user, post=post)
+        call_command('rebuild_comment_counts', stdout=StringIO())
+
+    def test_feed_query_count_is_constant(self):
+        """Test that a feed page costs the same number of queries for 2 or 10 posts"""
+        # Token lookup, the post page, and the comment prefetch
+        self.create_posts(2)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('post-list-create'), secure=True)
+        self.assertEqual(response.data['results'][0]['comments_count'], 2)
+
+        # The token is cached from here on
+        self.create_posts(8)
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('post-list-create'), secure=True)
+        self.assertEqual(len(response.data['results']), 10)
+
+    def test_detail_query_count(self):
+        """Test that the post detail loads author and comments eagerly"""
+        self.create_posts(1)
+        post = Post.objects.get()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('post-detail', args=[post.pk]), secure=True)
+        self.assertEqual(len(response.data['comments']), 2)
+        self.assertEqual(response.data['comments_count'], 2)
+
+    def test_latest_comments_are_bounded(self):
+        """Test that ?latest_comments=N embeds only the newest N comments in one query"""
+        self.create_posts(3)
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('post-list-create'), {'latest_comments': 1}, secure=True)
+        for post in response.data['results']:
+            self.assertEqual([c['content'] for c in post['comments']], ['Second'])
+            self.assertEqual(post['comments_count'], 2)
+
+    def test_comment_list_filters_by_post(self):
+        """Test that /comments/?post=<id> pages through one post's comments"""
+        self.create_posts(2)
+        post = Post.objects.first()
+        response = self.client.get(reverse('comment-list-create'), {'post': post.pk, 'page_size': 1}, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([c['post'] for c in response.data['results']], [post.pk])
+        response = self.client.get(response.data['next'], secure=True)
+        self.assertEqual([c['content'] for c in response.data['results']], ['First'])
+        self.assertIsNone(response.data['next'])
+
+
+class CommentCounterTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user, self.token, self.client = authenticated_client('counter_user')
+        self.post = Post.objects.create(content='Counted post', author=self.user)
+
+    def test_counter_follows_create_and_delete(self):
+        """Test that creating and deleting comments keeps comment_count in step"""
+        url = reverse('comment-list-create')
+        first = self.client.post(url, {'content': 'One', 'post': self.post.pk}, format='json', secure=True)
+        self.client.post(url, {'content': 'Two', 'post': self.post.pk}, format='json', secure=True)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 2)
+
+        self.client.delete(reverse('comment-detail', args=[first.data['id']]), secure=True)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+    def test_cascade_delete_keeps_counter(self):
+        """Test that comments removed with their author are taken off the count"""
+        commenter = User.objects.create_user(username='counter_commenter')
+        self.client.force_authenticate(commenter)
+        self.client.post(reverse('comment-list-create'), {'content': 'Bye', 'post': self.post.pk}, format='json', secure=True)
+        commenter.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 0)
+
+    def test_rebuild_fixes_drift(self):
+        """Test that rebuild_comment_counts repairs a drifted counter"""
+        Comment.objects.create(content='Untracked', author=self.user, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(comment_count=7)
+        call_command('rebuild_comment_counts', stdout=StringIO())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, 1)
+
+
+class DetailCacheTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        detail_cache_stats.reset()
+        self.user, self.token, self.client = authenticated_client('cache_user')
+        self.post = Post.objects.create(content='Cached post', author=self.user)
+        self.url = reverse('post-detail', args=[self.post.pk])
+
+    def test_second_read_is_served_from_cache(self):
+        """Test that a repeated detail read skips the post queries"""
+        self.client.get(self.url, secure=True)
+        # Token and payload both come from cache
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, secure=True)
+        self.assertEqual(response.data['content'], 'Cached post')
+        self.assertEqual(detail_cache_stats.snapshot()['posts.post']['hits'], 1)
+
+    def test_put_writes_through(self):
+        """Test that an update replaces the cached payload"""
+        self.client.get(self.url, secure=True)
+        self.client.put(self.url, {'content': 'Edited'}, format='json', secure=True)
+        response = self.client.get(self.url, secure=True)
+        self.assertEqual(response.data['content'], 'Edited')
+
+    def test_new_comment_invalidates_parent_post(self):
+        """Test that commenting drops the cached parent post"""
+        self.client.get(self.url, secure=True)
+        self.client.post(reverse('comment-list-create'), {'content': 'Hi', 'post': self.post.pk}, format='json', secure=True)
+        response = self.client.get(self.url, secure=True)
+        self.assertEqual(response.data['comments_count'], 1)
+        self.assertEqual([c['content'] for c in response.data['comments']], ['Hi'])
+
+    def test_cascade_delete_invalidates(self):
+        """Test that rows removed by a cascade are not served from cache"""
+        comment = Comment.objects.create(content='Gone', author=self.user, post=self.post)
+        comment_url = reverse('comment-detail', args=[comment.pk])
+        self.client.get(self.url, secure=True)
+        self.client.get(comment_url, secure=True)
+        admin = User.objects.create_superuser(username='cache_admin', password='CacheAdmin123!')
+        self.client.force_authenticate(admin)
+        self.user.delete()
+        self.assertEqual(self.client.get(self.url, secure=True).status_code, 404)
+        self.assertEqual(self.client.get(comment_url, secure=True).status_code, 404)
+
+
+class CachedTokenAuthenticationTestCase(TestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.user, self.token, self.client = authenticated_client('token_user')
+
+    def test_token_lookup_is_cached(self):
+        """Test that only the first request looks the token up"""
+        with self.assertNumQueries(2):
+            self.client.get(reverse('comment-list-create'), secure=True)
+        with self.assertNumQueries(1):
+            self.client.get(reverse('comment-list-create'), secure=True)
+
+    def test_logout_evicts_token(self):
+        """Test that a logged-out token is rejected right away"""
+        self.client.get(reverse('comment-list-create'), secure=True)
+        response = self.client.post(reverse('logout_user'), secure=True)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(reverse('comment-list-create'), secure=True)
+        self.assertEqual(response.status_code, 401)
+
+    def test_delete_user_evicts_token(self):
+        """Test that a deleted user's cached token stops working"""
+        self.client.get(reverse('comment-list-create'), secure=True)
+        self.client.delete(reverse('delete_user', args=[self.user.pk]), secure=True)
+        response = self.client.get(reverse('comment-list-create'), secure=True)
+        self.assertEqual(response.status_code, 401)
+
+    def test_deploy_check_warns_on_process_local_cache(self):
+        """Test that check --deploy flags a cache that cannot reach other workers"""
+        self.assertEqual([w.id for w in check_shared_cache(None)], ['posts.W001'])
+        redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache'}}
+        with self.settings(CACHES=redis):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+class RoleResolutionTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        for name in ['Admin', 'Moderator', 'Regular']:
+            Group.objects.create(name=name)
+        self.author = User.objects.create_user(username='role_author', password='RoleAuthor123!')
+        self.user, _, self.user_client = authenticated_client('role_user')
+        self.admin, _, self.admin_client = authenticated_client('role_admin', is_staff=True)
+
+    def test_roles_are_cached_between_requests(self):
+        """Test that the Moderator check only hits the groups table once"""
+        request = APIRequestFactory().get('/')
+        request.user = self.user
+        with self.assertNumQueries(1):
+            self.assertFalse(IsModeratorUser().has_permission(request, None))
+            self.assertFalse(IsModeratorUser().has_permission(request, None))
+        request = APIRequestFactory().get('/')
+        request.user = self.user
+        with self.assertNumQueries(0):
+            self.assertFalse(IsModeratorUser().has_permission(request, None))
+
+    def test_assign_role_is_seen_on_next_request(self):
+        """Test that a new Moderator can moderate right after assign_role"""
+        post = Post.objects.create(content='Not yours', author=self.author)
+        url = reverse('post-detail', args=[post.pk])
+        self.assertEqual(self.user_client.delete(url, secure=True).status_code, 403)
+
+        self.admin_client.post(
+            reverse('assign_role'), {'user_id': self.user.pk, 'role': 'Moderator'},
+            format='json', secure=True
+        )
+        self.assertEqual(self.user_client.delete(url, secure=True).status_code, 204)
+
+
+class BulkCreateTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user, self.token, self.client = authenticated_client('bulk_user')
+
+    def test_bulk_posts_report_per_item_errors(self):
+        """Test that invalid items are reported without failing the batch"""
+        items = [{'content': 'One'}, {'content': '   '}, {'content': 'Three'}]
+        response = self.client.post(reverse('post-bulk-create'), items, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['created']), 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertEqual(Post.objects.filter(author=self.user).count(), 2)
+
+    def test_bulk_posts_atomic(self):
+        """Test that ?atomic=true rejects the whole batch on any error"""
+        items = [{'content': 'One'}, {'content': ''}]
+        url = reverse('post-bulk-create') + '?atomic=true'
+        response = self.client.post(url, items, format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Post.objects.exists())
+
+    def test_bulk_comments_update_counters(self):
+        """Test that bulk comments resolve posts in bulk and bump comment_count"""
+        post = Post.objects.create(content='Target', author=self.user)
+        items = [{'content': f'Comment {i}', 'post': post.pk} for i in range(3)]
+        items.append({'content': 'Orphan', 'post': post.pk + 100})
+        with self.assertNumQueries(6):
+            response = self.client.post(reverse('comment-bulk-create'), items, format='json', secure=True)
+        self.assertEqual(len(response.data['created']), 3)
+        self.assertEqual(response.data['errors'][0]['index'], 3)
+        post.refresh_from_db()
+        self.assertEqual(post.comment_count, 3)
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.admin, _, self.client = authenticated_client('export_admin', is_staff=True)
+        self.posts = [Post.objects.create(content=f'Post {i}', author=self.admin) for i in range(5)]
+
+    def read_lines(self, response):
+        body = b''.join(response.streaming_content).decode('utf-8')
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_export_streams_every_row_in_batches(self):
+        """Test that the export walks all rows across keyset batches"""
+        config = ConfigManager()
+        original = config.get_setting('EXPORT_BATCH_SIZE')
+        config.set_setting('EXPORT_BATCH_SIZE', 2)
+        try:
+            response = self.client.get(reverse('export', args=['posts']), secure=True)
+            rows = self.read_lines(response)
+        finally:
+            config.set_setting('EXPORT_BATCH_SIZE', original)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([row['id'] for row in rows], [post.id for post in self.posts])
+
+    def test_incremental_export(self):
+        """Test that ?since= only returns rows updated after the timestamp"""
+        since = self.posts[2].updated_at.isoformat()
+        response = self.client.get(reverse('export', args=['posts']), {'since': since}, secure=True)
+        self.assertEqual([row['id'] for row in self.read_lines(response)], [post.id for post in self.posts[3:]])
+
+    def test_export_command(self):
+        """Test that export_ndjson writes one JSON object per line"""
+        out = StringIO()
+        call_command('export_ndjson', 'posts', stdout=out, stderr=StringIO())
+        self.assertEqual(len(out.getvalue().splitlines()), 5)
+
+
+class AsyncReadPathTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user, self.token, _ = authenticated_client('async_user')
+        self.post = Post.objects.create(content='Async post', author=self.user)
+        Comment.objects.create(content='Async comment', author=self.user, post=self.post)
+        call_command('rebuild_comment_counts', stdout=StringIO())
+
+    def auth_headers(self, key=None):
+        return {'Authorization': f'Token {key or self.token.key}'}
+
+    async def test_async_feed_matches_sync_feed(self):
+        """Test that the async feed returns the same payload as the sync one"""
+        response = await self.async_client.get(reverse('async-post-list'), headers=self.auth_headers(), secure=True)
+        self.assertEqual(response.status_code, 200)
+        results = response.json()['results']
+        self.assertEqual(results[0]['content'], 'Async post')
+        self.assertEqual(results[0]['comments_count'], 1)
+        self.assertEqual(results[0]['comments'][0]['author'], 'async_user')
+
+    async def test_async_detail_and_lists(self):
+        """Test the async post detail, comment list and task list"""
+        headers = self.auth_headers()
+        response = await self.async_client.get(reverse('async-post-detail', args=[self.post.pk]), headers=headers, secure=True)
+        self.assertEqual(response.json()['id'], self.post.pk)
+        response = await self.async_client.get(reverse('async-post-detail', args=[self.post.pk + 100]), headers=headers, secure=True)
+        self.assertEqual(response.status_code, 404)
+        response = await self.async_client.get(reverse('async-comment-list'), {'post': self.post.pk}, headers=headers, secure=True)
+        self.assertEqual(len(response.json()['results']), 1)
+        response = await self.async_client.get(reverse('async-task-list'), headers=headers, secure=True)
+        self.assertEqual(response.json()['results'], [])
+
+    async def test_async_requires_token(self):
+        """Test that async endpoints reject missing or unknown tokens"""
+        response = await self.async_client.get(reverse('async-post-list'), secure=True)
+        self.assertEqual(response.status_code, 401)
+        response = await self.async_client.get(reverse('async-post-list'), headers=self.auth_headers('0' * 40), secure=True)
+        self.assertEqual(response.status_code, 401)
+
+
+class TaskListTestCase(TestCase):
+    def setUp(self):
+        self.user, _, self.client = authenticated_client('task_user')
+        self.other = User.objects.create_user(username='task_other', password='TaskOther123!')
+        TaskFactory.create_task('regular', 'Mine', '', self.user, {})
+        TaskFactory.create_task('priority', 'Urgent', '', self.user, {'priority_level': 'high'})
+        TaskFactory.create_task('priority', 'Later', '', self.user, {'priority_level': 'low'})
+        TaskFactory.create_task('regular', 'Theirs', '', self.other, {})
+
+    def test_task_list_is_paginated(self):
+        """Test that the task list pages through the user's own tasks"""
+        response = self.client.get(reverse('task_list'), {'page_size': 2}, secure=True)
+        self.assertEqual([task['title'] for task in response.data['results']], ['Later', 'Urgent'])
+        response = self.client.get(response.data['next'], secure=True)
+        self.assertEqual([task['title'] for task in response.data['results']], ['Mine'])
+
+    def test_task_list_filters(self):
+        """Test filtering by task_type and metadata priority_level"""
+        response = self.client.get(reverse('task_list'), {'task_type': 'priority', 'priority_level': 'high'}, secure=True)
+        self.assertEqual([task['title'] for task in response.data['results']], ['Urgent'])
+        response = self.client.get(reverse('task_list'), {'task_type': 'bogus'}, secure=True)
+        self.assertEqual(response.status_code, 400)
+
+    def test_next_tasks_by_priority(self):
+        """Test that tasks/next/ returns the highest priority tasks in one query"""
+        TaskFactory.create_task('priority', 'Fire', '', self.user, {'priority_level': 'Critical'})
+        TaskFactory.create_task('priority', 'Theirs too', '', self.other, {'priority_level': 'critical'})
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('next_tasks'), {'limit': 2}, secure=True)
+        self.assertEqual([task['title'] for task in response.data['results']], ['Fire', 'Urgent'])
+        self.assertEqual(response.data['results'][0]['priority_level'], 4)
+
+    def test_invalid_priority_level_is_rejected(self):
+        """Test that TaskFactory rejects unknown priority levels"""
+        with self.assertRaises(ValueError):
+            TaskFactory.create_task('priority', 'Huh', '', self.user, {'priority_level': 'whenever'})
+
+
+class BulkTaskCreationTestCase(TestCase):
+    def setUp(self):
+        self.user, _, self.client = authenticated_client('team_lead')
+        self.team = [User.objects.create_user(username=f'member_{i}') for i in range(3)]
+
+    def test_assign_recurring_task_to_team(self):
+        """Test that a whole team gets its task in one request and a fixed number of queries"""
+        items = [{
+            'title': 'Standup notes',
+            'task_type': 'recurring',
+            'assigned_to': member.id,
+            'metadata': {'frequency': 'daily'},
+        } for member in self.team]
+        # Token, in_bulk, savepoint, insert, release
+        with self.assertNumQueries(5):
+            response = self.client.post(reverse('bulk_create_task'), items, format='json', secure=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data['task_ids']), 3)
+        self.assertEqual(Task.objects.filter(assigned_to__in=self.team).count(), 3)
+
+    def test_invalid_item_rejects_batch(self):
+        """Test that one invalid item fails the batch with per-item errors"""
+        items = [
+            {'title': 'Fine'},
+            {'title': 'No level', 'task_type': 'priority', 'metadata': {}},
+            {'title': 'Nobody', 'assigned_to': 999999},
+        ]
+        response = self.client.post(reverse('bulk_create_task'), items, format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertFalse(Task.objects.exists())
+
+    def test_non_object_metadata_is_rejected(self):
+        """Test that metadata that is not an object is a 400 for that item"""
+        items = [{'title': 'Odd', 'task_type': 'priority', 'metadata': 5}]
+        response = self.client.post(reverse('bulk_create_task'), items, format='json', secure=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['errors'], [{'index': 0, 'error': "'metadata' must be an object"}])
+
+
+class RecurringSchedulerTestCase(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='recurring_user', password='Recurring123!')
+        self.task = TaskFactory.create_task(
+            task_type='recurring', title='Water plants', description='',
+            assigned_to=self.user, metadata={'frequency': 'daily'}
+        )
+
+    def test_tick_materializes_due_occurrences_once(self):
+        """Test that ticks create each due occurrence exactly once"""
+        now = self.task.next_run_at + timedelta(days=2, hours=1)
+        self.assertEqual(scheduler.tick(now=now), 3)
+        self.assertEqual(self.task.occurrences.count(), 3)
+        self.assertEqual(scheduler.tick(now=now), 0)
+
+        # A second tick that read the old next_run_at must not duplicate slots
+        first_run = self.task.next_run_at
+        Task.objects.filter(pk=self.task.pk).update(next_run_at=first_run)
+        scheduler.tick(now=now)
+        self.assertEqual(self.task.occurrences.count(), 3)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.next_run_at, first_run + timedelta(days=3))
+
+    def test_unsupported_frequency_is_rejected(self):
+        """Test that TaskFactory only accepts frequencies the scheduler understands"""
+        with self.assertRaises(ValueError):
+            TaskFactory.create_task(
+                task_type='recurring', title='Odd', description='',
+                assigned_to=self.user, metadata={'frequency': 'fortnightly-ish'}
+            )
+
+
+class RateLimitTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        limiter.reset()
+        self.config = ConfigManager()
+        self.saved_limit = self.config.get_setting('RATE_LIMIT')
+        self.config.set_setting('RATE_LIMIT', 3)
+        self.user, self.token, _ = authenticated_client('limited_user')
+        # Starts out anonymous; tests add the token where they need it
+        self.client = APIClient()
+
+    def tearDown(self):
+        self.config.set_setting('RATE_LIMIT', self.saved_limit)
+        limiter.reset()
+
+    def test_limit_returns_429_with_retry_after(self):
+        """Test that a client over RATE_LIMIT gets 429 and Retry-After"""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        statuses = [self.client.get(reverse('comment-list-create'), secure=True).status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        response = self.client.get(reverse('comment-list-create'), secure=True)
+        self.assertEqual(int(response['Retry-After']), 20)
+
+    def test_clients_are_limited_separately(self):
+        """Test that one client's burst does not limit another"""
+        token_client = APIClient()
+        token_client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        # A verified token is its own client once it is in the token cache
+        token_client.get(reverse('comment-list-create'), secure=True)
+        for _ in range(4):
+            self.client.get(reverse('comment-list-create'), secure=True)
+        self.assertEqual(token_client.get(reverse('comment-list-create'), secure=True).status_code, 200)
+
+    def test_bucket_refills(self):
+        """Test that tokens come back at RATE_LIMIT per RATE_LIMIT_PERIOD"""
+        bucket = TokenBucketLimiter()
+        self.assertEqual([bucket.allow('k', 2, 60, now=0)[0] for _ in range(3)], [True, True, False])
+        self.assertTrue(bucket.allow('k', 2, 60, now=30)[0])
+
+    def test_unverified_tokens_are_limited_by_ip(self):
+        """Test that a made-up token per request does not get a fresh bucket"""
+        statuses = []
+        for i in range(4):
+            self.client.credentials(HTTP_AUTHORIZATION=f'Token bogus{i}')
+            statuses.append(self.client.get(reverse('comment-list-create'), secure=True).status_code)
+        self.assertEqual(statuses, [401, 401, 401, 429])
+        # Over the limit, a fresh made-up token is refused without a lookup
+        self.client.credentials(HTTP_AUTHORIZATION='Token bogus-fresh')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('comment-list-create'), secure=True).status_code, 429)
+
+    def test_unknown_tokens_are_cached_as_invalid(self):
+        """Test that a rejected token is not looked up again"""
+        self.config.set_setting('RATE_LIMIT', 100)
+        self.client.credentials(HTTP_AUTHORIZATION='Token bogus')
+        self.client.get(reverse('comment-list-create'), secure=True)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(reverse('comment-list-create'), secure=True).status_code, 401)
+
+    async def test_async_requests_are_limited(self):
+        """Test that the limit also applies when the stack runs under ASGI"""
+        headers = {'Authorization': f'Token {self.token.key}'}
+        statuses = [
+            (await self.async_client.get(reverse('async-post-list'), headers=headers, secure=True)).status_code
+            for _ in range(4)
+        ]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+
+
+class PasswordHashingGateTestCase(TestCase):
+    def setUp(self):
+        self.config = ConfigManager()
+        self.saved = {key: self.config.get_setting(key) for key in ('PASSWORD_HASH_CONCURRENCY', 'PASSWORD_HASH_QUEUE')}
+        self.config.set_setting('PASSWORD_HASH_CONCURRENCY', 1)
+        self.config.set_setting('PASSWORD_HASH_QUEUE', 0)
+        User.objects.create_user(username='gate_user', password='GateUser123!')
+
+    def tearDown(self):
+        for key, value in self.saved.items():
+            self.config.set_setting(key, value)
+
+    def test_full_gate_rejects_immediately(self):
+        """Test that the gate refuses new work once slots and queue are full"""
+        gate = HashingGate()
+        with gate.slot():
+            with self.assertRaises(HashingBusy):
+                with gate.slot():
+                    pass
+        with gate.slot():
+            pass
+
+    def test_login_returns_503_when_busy(self):
+        """Test that login answers 503 with Retry-After while hashing is saturated"""
+        with password_hashing.slot():
+            response = APIClient().post(
+                reverse('login_user'), {'username': 'gate_user', 'password': 'GateUser123!'},
+                format='json', secure=True
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '1')
+
+
+class LoggingPipelineTestCase(TestCase):
+    def test_full_queue_drops_instead_of_blocking(self):
+        """Test that a full log buffer drops records and counts them"""
+        handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+        logger = logging.getLogger('test_dropping_logger')
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            for i in range(3):
+                logger.warning('record %d', i)
+        finally:
+            logger.removeHandler(handler)
+        self.assertEqual(handler.dropped, 2)
+        self.assertEqual(handler.queue.get_nowait().getMessage(), 'record 0')
+
+    def test_json_formatter_includes_context(self):
+        """Test that JSON output carries lazy args and structured context"""
+        record = logging.LogRecord('task_logger', logging.INFO, __file__, 1, 'Task %s created', (7,), None)
+        record.context = {'task_id': 7}
+        payload = json.loads(JsonFormatter().format(record))
+        self.assertEqual(payload['message'], 'Task 7 created')
+        self.assertEqual(payload['task_id'], 7)
+
+    def test_json_traceback_survives_the_queue(self):
+        """Test that records passed through the queue keep the traceback out of the message"""
+        handler = DroppingQueueHandler(queue.Queue())
+        logger = logging.getLogger('test_queued_json_logger')
+        logger.addHandler(handler)
+        logger.propagate = False
+        try:
+            try:
+                1 / 0
+            except ZeroDivisionError:
+                logger.exception('Task %s failed', 7, extra={'context': {'task_id': 7}})
+        finally:
+            logger.removeHandler(handler)
+        payload = json.loads(JsonFormatter().format(handler.queue.get_nowait()))
+        self.assertEqual(payload['message'], 'Task 7 failed')
+        self.assertEqual(payload['task_id'], 7)
+        self.assertIn('ZeroDivisionError', payload['exc_info'])
+
+
+class RequestMetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        request_metrics.reset()
+        self.config = ConfigManager()
+        self.saved = {key: self.config.get_setting(key) for key in ('METRICS_SAMPLE_RATE', 'METRICS_QUERY_THRESHOLD')}
+        self.admin, self.token, self.client = authenticated_client('metrics_admin', is_staff=True)
+
+    def tearDown(self):
+        for key, value in self.saved.items():
+            self.config.set_setting(key, value)
+        request_metrics.reset()
+
+    def test_histograms_per_url_name(self):
+        """Test that requests are recorded under their URL name and exposed as Prometheus text"""
+        self.client.get(reverse('comment-list-create'), secure=True)
+        self.client.get(reverse('comment-list-create'), secure=True)
+        response = self.client.get(reverse('metrics'), secure=True)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('http_request_duration_seconds_count{view="comment-list-create"} 2', body)
+        self.assertIn('http_request_db_queries_bucket{view="comment-list-create",le="+Inf"} 2', body)
+        self.assertIn('detail_cache_events_total', body)
+
+    def test_query_threshold_is_flagged(self):
+        """Test that requests over METRICS_QUERY_THRESHOLD are counted"""
+        self.config.set_setting('METRICS_QUERY_THRESHOLD', 1)
+        self.client.get(reverse('comment-list-create'), secure=True)
+        body = self.client.get(reverse('metrics'), {'cache': '0'}, secure=True).content.decode()
+        self.assertIn('http_requests_over_query_threshold_total{view="comment-list-create"} 1', body)
+        self.assertNotIn('detail_cache_events_total', body)
+        self.assertEqual(request_metrics.recent_over_threshold[0]['view'], 'comment-list-create')
+
+    def test_sampling_off_records_nothing(self):
+        """Test that a zero sample rate skips instrumentation"""
+        self.config.set_setting('METRICS_SAMPLE_RATE', 0)
+        self.client.get(reverse('comment-list-create'), secure=True)
+        self.assertNotIn('view="comment-list-create"', request_metrics.render())
+
+    async def test_async_orm_queries_are_counted(self):
+        """Test that queries the async ORM runs off the event loop are counted"""
+        headers = {'Authorization': f'Token {self.token.key}'}
+        await self.async_client.get(reverse('async-task-list'), headers=headers, secure=True)
+        body = request_metrics.render()
+        self.assertIn('http_request_duration_seconds_count{view="async-task-list"} 1', body)
+        # Token lookup plus the task page
+        self.assertIn('http_request_db_queries_bucket{view="async-task-list",le="1"} 0', body)
+
+    def test_middleware_stays_async_under_asgi(self):
+        """Test that the metrics and rate limit middleware don't need a thread under ASGI"""
+        async def get_response(request):
+            return None
+        for middleware in (MetricsMiddleware, RateLimitMiddleware):
+            self.assertTrue(iscoroutinefunction(middleware(get_response)))
+            self.assertFalse(iscoroutinefunction(middleware(lambda request: None)))
+
+
+class BenchmarkSeedTestCase(TestCase):
+    def test_seed_is_reproducible_and_consistent(self):
+        """Test that seeding is deterministic and keeps comment_count in step"""
+        seed_dataset(users=3, posts=10, comments=60, tasks=20, seed=7)
+        counts = list(Post.objects.order_by('id').values_list('comment_count', flat=True))
+        self.assertEqual(sum(counts), 60)
+        for post in Post.objects.all():
+            self.assertEqual(post.comment_count, post.comments.count())
+        self.assertEqual(Token.objects.count(), 3)
+        self.assertFalse(Task.objects.filter(task_type='priority', priority_level__isnull=True).exists())
+
+        Comment.objects.all().delete()
+        Post.objects.all().delete()
+        Task.objects.all().delete()
+        User.objects.all().delete()
+        seed_dataset(users=3, posts=10, comments=60, tasks=20, seed=7)
+        self.assertEqual(list(Post.objects.order_by('id').values_list('comment_count', flat=True)), counts)
+
+    def test_seed_data_command(self):
+        """Test that seed_data loads the requested rows and refuses to reuse a prefix"""
+        out = StringIO()
+        call_command('seed_data', users=4, posts=20, comments=150, tasks=30, batch_size=7,
+                     task_mix='0,1,0', stdout=out)
+        self.assertEqual(User.objects.filter(username__startswith='seed_user_').count(), 4)
+        self.assertEqual(Comment.objects.count(), 150)
+        self.assertEqual(sum(Post.objects.values_list('comment_count', flat=True)), 150)
+        self.assertEqual(Task.objects.filter(task_type='priority', priority_level__isnull=False).count(), 30)
+        self.assertTrue(User.objects.get(username='seed_user_0').check_password('SeedUser123!'))
+        with self.assertRaises(CommandError):
+            call_command('seed_data', users=1, posts=0, comments=0, tasks=0, stdout=out)
+
+
+class UserDirectoryTestCase(TestCase):
+    def setUp(self):
+        regular = Group.objects.create(name='Regular')
+        for i in range(5):
+            User.objects.create_user(username=f'directory_{i}', email=f'd{i}@test.com', password='Directory123!')
+        for user in User.objects.all():
+            user.groups.add(regular)
+        self.viewer = User.objects.first()
+
+    def list_users(self, **params):
+        request = APIRequestFactory().get('/', params)
+        force_authenticate(request, user=self.viewer)
+        return UserListCreate.as_view()(request)
+
+    def test_get_users_pages_on_id(self):
+        """Test that get_users returns keyset pages with sparse fields"""
+        response = self.client.get(reverse('get_users'), {'page_size': 2, 'fields': 'username'}, secure=True)
+        data = response.json()
+        self.assertEqual(data['results'], [
+            {'id': user.id, 'username': user.username} for user in User.objects.order_by('id')[:2]
+        ])
+        seen = [user['id'] for user in data['results']]
+        while data['next']:
+            data = self.client.get(data['next'], secure=True).json()
+            seen.extend(user['id'] for user in data['results'])
+        self.assertEqual(seen, list(User.objects.order_by('id').values_list('id', flat=True)))
+
+    def test_get_users_rejects_unknown_fields(self):
+        """Test that projection is limited to directory fields"""
+        response = self.client.get(reverse('get_users'), {'fields': 'password'}, secure=True)
+        self.assertEqual(response.status_code, 400)
+
+    def test_user_list_prefetches_groups(self):
+        """Test that UserListCreate loads groups for a whole page in one query"""
+        with self.assertNumQueries(2):
+            response = self.list_users(page_size=10)
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertEqual(len(response.data['results'][0]['groups']), 1)
+        with self.assertNumQueries(1):
+            response = self.list_users(fields='username')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'username'})
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        self.user, _, self.client = authenticated_client('search_user')
+        self.best = Post.objects.create(content='Kestrel kestrel kestrel', author=self.user)
+        Post.objects.bulk_create([Post(content=f'A kestrel sighting {i}', author=self.user) for i in range(4)])
+        Post.objects.create(content='Nothing to see <here>', author=self.user)
+
+    def search(self, **params):
+        return self.client.get(reverse('search'), params, secure=True)
+
+    def test_ranked_highlighted_pages(self):
+        """Test that search ranks by bm25, highlights matches and pages with a cursor"""
+        data = self.search(q='KESTREL', page_size=2).json()
+        self.assertEqual(data['results'][0]['id'], self.best.id)
+        self.assertIn('<mark>Kestrel</mark>', data['results'][0]['highlight'])
+        seen = [result['id'] for result in data['results']]
+        while data['next']:
+            data = self.client.get(data['next'], secure=True).json()
+            seen.extend(result['id'] for result in data['results'])
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(len(set(seen)), 5)
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test that the triggers keep the index in step with the posts table"""
+        self.best.content = 'Osprey'
+        self.best.save()
+        self.assertEqual([r['id'] for r in self.search(q='osprey').json()['results']], [self.best.id])
+        self.assertNotIn(self.best.id, [r['id'] for r in self.search(q='kestrel').json()['results']])
+        self.best.delete()
+        self.assertEqual(self.search(q='osprey').json()['results'], [])
+
+    def test_comments_and_escaping(self):
+        """Test comment search and that snippets are HTML-escaped"""
+        Comment.objects.create(content='Lovely <b>falcon</b>', author=self.user, post=self.best)
+        result = self.search(q='falcon', type='comments').json()['results'][0]
+        self.assertEqual(result['post'], self.best.id)
+        self.assertEqual(result['highlight'], 'Lovely &lt;b&gt;<mark>falcon</mark>&lt;/b&gt;')
+
+    def test_bad_queries(self):
+        """Test that empty queries and unknown types are rejected, and syntax is inert"""
+        self.assertEqual(self.search(q='  ').status_code, 400)
+        self.assertEqual(self.search(q='kestrel', type='tasks').status_code, 400)
+        self.assertEqual(self.search(q='"kestrel AND (').status_code, 200)
+
+
+class TimelineTestCase(TestCase):
+    def setUp(self):
+        self.config = ConfigManager()
+        self.saved_threshold = self.config.get_setting('FANOUT_ASYNC_THRESHOLD')
+        self.author, _, self.author_client = authenticated_client('timeline_author')
+        self.reader, _, self.reader_client = authenticated_client('timeline_reader')
+
+    def tearDown(self):
+        self.config.set_setting('FANOUT_ASYNC_THRESHOLD', self.saved_threshold)
+
+    def timeline_ids(self, client):
+        return [post['id'] for post in client.get(reverse('timeline'), secure=True).json()['results']]
+
+    def test_follow_fan_out_and_unfollow(self):
+        """Test that followers get new posts, backfill on follow and lose them on unfollow"""
+        old = Post.objects.create(content='Before the follow', author=self.author)
+        response = self.reader_client.post(reverse('follow_user', args=[self.author.pk]), secure=True)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.timeline_ids(self.reader_client), [old.id])
+
+        new_id = self.author_client.post(reverse('post-list-create'), {'content': 'Fresh'}, format='json', secure=True).json()['id']
+        self.assertEqual(self.timeline_ids(self.reader_client), [new_id, old.id])
+        self.assertEqual(self.timeline_ids(self.author_client), [new_id])
+
+        response = self.reader_client.delete(reverse('follow_user', args=[self.author.pk]), secure=True)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.timeline_ids(self.reader_client), [])
+
+    def test_timeline_query_count_is_constant(self):
+        """Test that a timeline page costs the same number of queries however long it is"""
+        Follow.objects.create(follower=self.reader, followee=self.author)
+        posts = Post.objects.bulk_create([Post(content=f'Post {i}', author=self.author) for i in range(15)])
+        timeline.publish(self.author.pk, posts)
+        for post in posts[:5]:
+            Comment.objects.create(content='Nice', author=self.reader, post=post)
+        self.reader_client.get(reverse('timeline'), secure=True)
+        # Token lookup is cached now: page of entries+posts+authors, then comments
+        with self.assertNumQueries(2):
+            response = self.reader_client.get(reverse('timeline'), secure=True)
+        self.assertEqual(len(response.json()['results']), 15)
+
+    def test_large_audiences_fan_out_after_commit(self):
+        """Test that authors over FANOUT_ASYNC_THRESHOLD fan out in the background"""
+        self.config.set_setting('FANOUT_ASYNC_THRESHOLD', 0)
+        Follow.objects.create(follower=self.reader, followee=self.author)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.author_client.post(reverse('post-list-create'), {'content': 'Big news'}, format='json', secure=True)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(len(self.timeline_ids(self.author_client)), 1)
+        self.assertEqual(self.timeline_ids(self.reader_client), [])
+        post = Post.objects.get(content='Big news')
+        timeline.fan_out(self.author.pk, [(post.pk, post.created_at)], include_author=False)
+        self.assertEqual(self.timeline_ids(self.reader_client), [post.pk])
+
+    def test_threshold_counts_posts_times_followers(self):
+        """Test that a big batch for a small audience also goes to the background"""
+        self.config.set_setting('FANOUT_ASYNC_THRESHOLD', 3)
+        Follow.objects.create(follower=self.reader, followee=self.author)
+        posts = Post.objects.bulk_create([Post(content=f'Post {i}', author=self.author) for i in range(3)])
+        with self.captureOnCommitCallbacks() as callbacks:
+            timeline.publish(self.author.pk, posts)
+        self.assertEqual(len(callbacks), 0)
+        posts = Post.objects.bulk_create([Post(content=f'More {i}', author=self.author) for i in range(4)])
+        with self.captureOnCommitCallbacks() as callbacks:
+            timeline.publish(self.author.pk, posts)
+        self.assertEqual(len(callbacks), 1)
+
+
+class ConditionalRequestTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.user, _, self.client = authenticated_client('etag_user')
+        self.post = Post.objects.create(content='Versioned', author=self.user)
+        self.url = reverse('post-detail', args=[self.post.pk])
+
+    def test_detail_not_modified_without_queries(self):
+        """Test that a matching If-None-Match is answered 304 from the cache pointer"""
+        response = self.client.get(self.url, secure=True)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, secure=True)
+        self.assertEqual(response.status_code, 304)
+
+        # A new comment is part of the post's representation
+        self.client.post(reverse('comment-list-create'), {'content': 'Hi', 'post': self.post.pk}, format='json', secure=True)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_cold_conditional_detail(self):
+        """Test that a conditional request works before the detail is cached"""
+        etag = self.client.get(self.url, secure=True)['ETag']
+        cache.clear()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, secure=True)
+        self.assertEqual(response.status_code, 304)
+
+    def test_if_match_on_put(self):
+        """Test that PUT with a stale If-Match is refused with 412"""
+        etag = self.client.get(self.url, secure=True)['ETag']
+        response = self.client.put(self.url, {'content': 'First edit'}, format='json', HTTP_IF_MATCH=etag, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        response = self.client.put(self.url, {'content': 'Lost update'}, format='json', HTTP_IF_MATCH=etag, secure=True)
+        self.assertEqual(response.status_code, 412)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.content, 'First edit')
+
+    def test_collection_etag_sees_deletes(self):
+        """Test that list ETags change when a row is deleted"""
+        other = Post.objects.create(content='Older', author=self.user)
+        Post.objects.filter(pk=other.pk).update(updated_at=self.post.updated_at - timedelta(days=1))
+        url = reverse('post-list-create')
+        etag = self.client.get(url, secure=True)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, secure=True).status_code, 304)
+        Post.objects.filter(pk=other.pk).delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag, secure=True).status_code, 200)
+
+        etag = self.client.get(reverse('task_list'), secure=True)['ETag']
+        self.assertEqual(self.client.get(reverse('task_list'), HTTP_IF_NONE_MATCH=etag, secure=True).status_code, 304)
+
+    def test_collection_304_reads_only_the_page(self):
+        """Test that a list revalidation is one bounded page query and sees edits"""
+        url = reverse('post-list-create')
+        etag = self.client.get(url, {'sort': 'engagement'}, secure=True)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'sort': 'engagement'}, HTTP_IF_NONE_MATCH=etag, secure=True)
+        self.assertEqual(response.status_code, 304)
+        Post.objects.filter(pk=self.post.pk).update(content='Edited', updated_at=timezone.now())
+        response = self.client.get(url, {'sort': 'engagement'}, HTTP_IF_NONE_MATCH=etag, secure=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['content'], 'Edited')
+
+
+class DeltaSyncTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        self.config = ConfigManager()
+        self.saved_settle = self.config.get_setting('SYNC_SETTLE_SECONDS')
+        self.config.set_setting('SYNC_SETTLE_SECONDS', 0)
+        self.user, _, self.client = authenticated_client('sync_user')
+        self.other = User.objects.create_user(username='sync_other', password='SyncOther123!')
+        self.post = Post.objects.create(content='Synced', author=self.user)
+        self.comment = Comment.objects.create(content='Synced comment', author=self.other, post=self.post)
+        self.task = Task.objects.create(title='Mine', assigned_to=self.user)
+        Task.objects.create(title='Not mine', assigned_to=self.other)
+
+    def tearDown(self):
+        self.config.set_setting('SYNC_SETTLE_SECONDS', self.saved_settle)
+
+    def sync(self, cursor=None, **params):
+        if cursor:
+            params['cursor'] = cursor
+        response = self.client.get(reverse('sync'), params, secure=True)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_initial_sync_then_up_to_date_is_one_query(self):
+        """Test the first sync and that an up-to-date client costs one query"""
+        data = self.sync()
+        self.assertEqual([row['id'] for row in data['changes']['posts']], [self.post.id])
+        self.assertEqual([row['id'] for row in data['changes']['comments']], [self.comment.id])
+        self.assertEqual([row['id'] for row in data['changes']['tasks']], [self.task.id])
+        self.assertFalse(data['has_more'])
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('sync'), {'cursor': data['cursor']}, secure=True)
+        self.assertEqual(response.json()['changes'], {'posts': [], 'comments': [], 'tasks': []})
+
+    def test_updates_and_tombstones(self):
+        """Test that edits come back as changes and deletes, cascades included, as tombstones"""
+        cursor = self.sync()['cursor']
+        self.task.title = 'Renamed'
+        self.task.save()
+        data = self.sync(cursor)
+        self.assertEqual([row['title'] for row in data['changes']['tasks']], ['Renamed'])
+
+        post_id, comment_id, task_id = self.post.id, self.comment.id, self.task.id
+        self.post.delete()
+        self.user.tasks.all().delete()
+        self.other.delete()
+        data = self.sync(data['cursor'])
+        self.assertEqual(data['deleted']['posts'], [post_id])
+        self.assertEqual(data['deleted']['comments'], [comment_id])
+        # The other user's task is gone too, but it was never theirs to see
+        self.assertEqual(data['deleted']['tasks'], [task_id])
+        self.assertEqual(self.sync(data['cursor'])['deleted'], {'posts': [], 'comments': [], 'tasks': []})
+
+    def test_paging_and_settle_window(self):
+        """Test has_more paging and that recent changes are re-sent while settling"""
+        Post.objects.bulk_create([Post(content=f'Post {i}', author=self.user) for i in range(4)])
+        data = self.sync(page_size=2)
+        seen = [row['id'] for row in data['changes']['posts']]
+        while data['has_more']:
+            data = self.sync(data['cursor'], page_size=2)
+            seen.extend(row['id'] for row in data['changes']['posts'])
+        self.assertEqual(seen, list(Post.objects.order_by('updated_at', 'id').values_list('id', flat=True)))
+
+        self.config.set_setting('SYNC_SETTLE_SECONDS', 60)
+        data = self.sync()
+        self.assertEqual(len(self.sync(data['cursor'])['changes']['posts']), 5)
+        # Pages past the horizon would only repeat unsettled rows
+        data = self.sync(page_size=2)
+        self.assertFalse(data['has_more'])
+        self.assertEqual(len(self.sync(data['cursor'], page_size=2)['changes']['posts']), 2)
+        self.assertEqual(advance([], 2, 'updated_at', None), (None, False))
+
+    def test_expired_and_invalid_cursors(self):
+        """Test that cursors past tombstone retention get 410 and garbage gets 404"""
+        positions = decode_cursor(self.sync()['cursor'])
+        # Regular clients keep up even when nothing is deleted for a long time
+        positions['deleted'] = (timezone.now() - timedelta(days=10), 0)
+        self.assertEqual(self.client.get(reverse('sync'), {'cursor': encode_cursor(positions)}, secure=True).status_code, 200)
+        positions['deleted'] = (timezone.now() - timedelta(days=31), 0)
+        old = self.client.get(reverse('sync'), {'cursor': encode_cursor(positions)}, secure=True)
+        self.assertEqual(old.status_code, 410)
+        self.assertEqual(self.client.get(reverse('sync'), {'cursor': 'garbage'}, secure=True).status_code, 404)
+        for deleted in (None, ['2026-10-18T00:00:00', 0]):
+            cursor = base64.urlsafe_b64encode(json.dumps({
+                'posts': None, 'comments': None, 'tasks': None, 'deleted': deleted,
+            }).encode()).decode()
+            self.assertEqual(self.client.get(reverse('sync'), {'cursor': cursor}, secure=True).status_code, 404)
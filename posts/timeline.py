@@ -0,0 +1,93 @@
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection, transaction
+from singletons.config_manager import ConfigManager
+from singletons.logger_singleton import LoggerSingleton
+from .models import Follow, Post, TimelineEntry
+
+config = ConfigManager()
+logger = LoggerSingleton().get_logger()
+
+# Fan-out for authors with many followers runs here, off the request thread
+fanout_executor = ThreadPoolExecutor(max_workers=config.get_setting('FANOUT_WORKERS'), thread_name_prefix='fanout')
+atexit.register(fanout_executor.shutdown, wait=True)
+
+def fan_out(author_id, posts, include_author=True):
+    """
+    Write (post, created_at) pairs into the timelines of the author's
+    followers, reading follower ids in chunks and inserting in batches.
+    Already-present entries are skipped, so re-running is harmless.
+    """
+    batch_size = config.get_setting('BULK_BATCH_SIZE')
+    followers = Follow.objects.filter(followee_id=author_id).values_list('follower_id', flat=True)
+    user_ids = followers.iterator(chunk_size=batch_size)
+    if include_author:
+        user_ids = _with_first(author_id, user_ids)
+    written = 0
+    batch = []
+    for user_id in user_ids:
+        batch.extend(
+            TimelineEntry(user_id=user_id, post_id=post_id, author_id=author_id, created_at=created_at)
+            for post_id, created_at in posts
+        )
+        if len(batch) >= batch_size:
+            TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            written += len(batch)
+            batch = []
+    if batch:
+        TimelineEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+    return written
+
+def _with_first(first, rest):
+    yield first
+    for item in rest:
+        if item != first:
+            yield item
+
+def _background_fan_out(author_id, posts):
+    try:
+        written = fan_out(author_id, posts, include_author=False)
+        logger.info("Fanned out %d posts by user %s: %d timeline entries", len(posts), author_id, written)
+    except Exception:
+        logger.exception("Timeline fan-out failed for user %s", author_id)
+    finally:
+        # Pool threads outlive requests; don't leak their connections
+        connection.close()
+
+def publish(author_id, posts):
+    """
+    Put new posts into timelines. The author's own timeline is always
+    written inline. Followers are written inline too unless that would
+    be more than FANOUT_ASYNC_THRESHOLD timeline entries (posts times
+    followers); then the work goes to the background pool once the
+    surrounding transaction commits.
+    """
+    posts = [(post.pk, post.created_at) for post in posts]
+    if not posts:
+        return
+    max_followers = config.get_setting('FANOUT_ASYNC_THRESHOLD') // len(posts)
+    # Reads at most max_followers + 1 index entries instead of counting them all
+    if not Follow.objects.filter(followee_id=author_id).values('id')[max_followers:max_followers + 1].exists():
+        fan_out(author_id, posts)
+        return
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(user_id=author_id, post_id=pk, author_id=author_id, created_at=at) for pk, at in posts],
+        ignore_conflicts=True,
+    )
+    transaction.on_commit(lambda: fanout_executor.submit(_background_fan_out, author_id, posts))
+
+def backfill(follower_id, followee_id):
+    """Copy the followee's most recent posts into a new follower's timeline."""
+    limit = config.get_setting('TIMELINE_BACKFILL')
+    recent = Post.objects.filter(author_id=followee_id).order_by('-created_at', '-id').values_list('id', 'created_at')[:limit]
+    TimelineEntry.objects.bulk_create(
+        [
+            TimelineEntry(user_id=follower_id, post_id=post_id, author_id=followee_id, created_at=created_at)
+            for post_id, created_at in recent
+        ],
+        ignore_conflicts=True,
+    )
+
+def unfollow_cleanup(follower_id, followee_id):
+    TimelineEntry.objects.filter(user_id=follower_id, author_id=followee_id).delete()
@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import views, async_views
 
 urlpatterns = [
     path('users/', views.get_users, name='get_users'),
@@ -12,15 +12,33 @@ urlpatterns = [
     path('users/assign-role/', views.assign_role, name='assign_role'),
     path('users/update-staff-status/', views.update_staff_status, name='update_staff_status'),
     path('users/make-admin/', views.make_user_admin, name='make_user_admin'),
+    path('users/<int:id>/follow/', views.FollowView.as_view(), name='follow_user'),
 
     path('', views.PostListCreate.as_view(), name='post-list-create'),
+    path('timeline/', views.TimelineView.as_view(), name='timeline'),
+    path('posts/bulk/', views.PostBulkCreate.as_view(), name='post-bulk-create'),
     path('posts/<int:pk>/', views.PostDetail.as_view(), name='post-detail'),
 
     path('comments/', views.CommentListCreate.as_view(), name='comment-list-create'),
+    path('comments/bulk/', views.CommentBulkCreate.as_view(), name='comment-bulk-create'),
     path('comments/<int:pk>/', views.CommentDetail.as_view(), name='comment-detail'),
 
+    path('sync/', views.SyncView.as_view(), name='sync'),
+    path('search/', views.SearchView.as_view(), name='search'),
+    path('export/<str:kind>/', views.ExportView.as_view(), name='export'),
+    path('metrics/', views.MetricsView.as_view(), name='metrics'),
+    path('metrics/cache/', views.CacheStatsView.as_view(), name='cache_stats'),
+
+    # ASGI-native read paths
+    path('async/posts/', async_views.post_list, name='async-post-list'),
+    path('async/posts/<int:pk>/', async_views.post_detail, name='async-post-detail'),
+    path('async/comments/', async_views.comment_list, name='async-comment-list'),
+    path('async/tasks/', async_views.task_list, name='async-task-list'),
+
     path('tasks/create/', views.CreateTaskView.as_view(), name='create_task'),
+    path('tasks/bulk/', views.BulkCreateTaskView.as_view(), name='bulk_create_task'),
     path('tasks/', views.TaskListView.as_view(), name='task_list'),
+    path('tasks/next/', views.NextTasksView.as_view(), name='next_tasks'),
 
   ]
 
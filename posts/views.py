@@ -1,35 +1,49 @@
 # Imports
 import json
-from django.http import JsonResponse
+from collections import Counter
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import render
 from django.core.validators import validate_email
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, serializers
-from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import APIException
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.contrib.auth.models import User as AuthUser, Group
 from django.contrib.auth import authenticate, logout
 from django.contrib.auth.decorators import login_required
 from rest_framework.authtoken.models import Token
-from .permissions import IsPostAuthor, IsAdminUser, IsModeratorUser
+from .authentication import CachedTokenAuthentication, evict_token, evict_user_tokens
+from .permissions import IsPostAuthor, IsAdminUser, IsModeratorUser, bump_role_version
 from rest_framework.decorators import api_view, permission_classes, authentication_classes
 from django.db import transaction
+from django.db.models import Case, F, IntegerField, Prefetch, Value, When
 from django.http import Http404
-from .models import Post, Comment, Task
-from .serializers import PostSerializer, CommentSerializer
+from .models import Post, Comment, Task, Follow, TimelineEntry
+from .timeline import backfill, publish, unfollow_cleanup
+from .sync import sync
+from .serializers import PostSerializer, CommentSerializer, BulkCommentSerializer, TaskSerializer, SparseFieldsMixin, parse_fields
+from .pagination import KeysetPagination
+from .export import EXPORTS, iter_ndjson
+from .hashing import password_hashing, HashingBusy
+from .metrics import request_metrics
+from .conditional import collection_condition, collection_paginator, detail_condition, detail_etag, if_match_passes, set_validators
+from .search import SEARCH_INDEXES, SearchPagination, attach_results, build_match, search_available
+from .cache import get_cached_detail, set_cached_detail, invalidate_detail, stats as cache_stats
 from singletons.logger_singleton import LoggerSingleton
 from singletons.config_manager import ConfigManager
-from factories.task_factory import TaskFactory
+from factories.task_factory import TaskFactory, TaskBatchError
 from django.contrib.auth.models import User
 
 logger = LoggerSingleton().get_logger()
 config = ConfigManager()
 
 # Serializers (moved to top)
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = AuthUser
         fields = ('id', 'username', 'email', 'groups')
@@ -56,6 +70,105 @@ def validate_user_input(data):
     validate_username(data['username'])
     validate_email(data['email'])
 
+def get_comments_limit(request):
+    """Parse ?latest_comments=N, which embeds only the newest N comments per post."""
+    value = request.GET.get('latest_comments')
+    if value is None:
+        return None
+    if not value.isdigit():
+        raise serializers.ValidationError({'latest_comments': 'Must be a non-negative integer'})
+    return min(int(value), config.get_setting('MAX_EMBEDDED_COMMENTS'))
+
+def get_bulk_items(request):
+    """Return the list of items in a bulk request body, or raise ValidationError."""
+    items = request.data
+    if isinstance(items, dict):
+        items = items.get('items')
+    if not isinstance(items, list) or not items:
+        raise serializers.ValidationError({'items': 'Expected a non-empty list of items'})
+    max_items = config.get_setting('MAX_BULK_ITEMS')
+    if len(items) > max_items:
+        raise serializers.ValidationError({'items': f'At most {max_items} items per request'})
+    return items
+
+def validate_bulk(serializer_class, items, context=None):
+    """
+    Validate every item with many=True and split the batch into
+    (valid (index, data) pairs, per-item errors).
+    """
+    serializer = serializer_class(data=items, many=True, context=context or {})
+    if serializer.is_valid():
+        return list(enumerate(serializer.validated_data)), []
+
+    item_errors = serializer.errors
+    # Depending on the DRF version errors come as a list or keyed by index
+    if isinstance(item_errors, dict):
+        item_errors = sorted(item_errors.items())
+    else:
+        item_errors = enumerate(item_errors)
+    errors = [{'index': index, 'errors': error} for index, error in item_errors if error]
+    failed = {error['index'] for error in errors}
+    indexes = [index for index in range(len(items)) if index not in failed]
+    if not indexes:
+        return [], errors
+    # Items that passed on their own; validate again to get their data
+    serializer = serializer_class(data=[items[index] for index in indexes], many=True, context=context or {})
+    serializer.is_valid(raise_exception=True)
+    return list(zip(indexes, serializer.validated_data)), errors
+
+def bulk_response(created, errors):
+    return Response({
+        'created': [obj.id for obj in created],
+        'errors': errors,
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+
+# Metadata keys that can be used as ?<key>=<value> filters on the task list
+TASK_METADATA_FILTERS = ('frequency',)
+
+def filter_tasks(queryset, params):
+    task_type = params.get('task_type')
+    if task_type is not None:
+        if task_type not in dict(Task.TASK_TYPES):
+            raise serializers.ValidationError({'task_type': 'Invalid task type'})
+        queryset = queryset.filter(task_type=task_type)
+    priority_level = params.get('priority_level')
+    if priority_level is not None:
+        # Served by the indexed column rather than the JSON metadata
+        try:
+            rank = TaskFactory.priority_rank(int(priority_level) if priority_level.isdigit() else priority_level)
+        except ValueError as e:
+            raise serializers.ValidationError({'priority_level': str(e)})
+        queryset = queryset.filter(priority_level=rank)
+    for key in TASK_METADATA_FILTERS:
+        value = params.get(key)
+        if value is not None:
+            queryset = queryset.filter(**{f'metadata__{key}': value})
+    return queryset
+
+# Querysets behind the list endpoints, shared with their collection ETags
+def post_collection(request):
+    return Post.objects.all()
+
+def post_paginator(request):
+    if request.query_params.get('sort') == 'engagement':
+        return KeysetPagination(ordering=('-comment_count', '-id'))
+    return KeysetPagination()
+
+def comment_collection(request):
+    comments = Comment.objects.all()
+    post_id = request.query_params.get('post')
+    if post_id is not None:
+        comments = comments.filter(post_id=post_id) if post_id.isdigit() else comments.none()
+    return comments
+
+def task_collection(request):
+    return filter_tasks(Task.objects.filter(assigned_to=request.user), request.query_params)
+
+def hashing_busy_response():
+    response = Response({'error': 'Too many concurrent logins, try again shortly'}, status=503)
+    response['Retry-After'] = '1'
+    return response
+
 def validate_post_input(data):
     if 'content' not in data:
         raise ValidationError("Content is required")
@@ -66,14 +179,23 @@ def validate_post_input(data):
     if not str(data['author']).isdigit():
         raise ValidationError("Author ID must be a number")
 
+USER_DIRECTORY_FIELDS = ('id', 'username', 'email')
+
 # API Views
 def get_users(request):
     if request.method != 'GET':
         return JsonResponse({'error': 'Method not allowed'}, status=405)
     
     try:
-        users = list(AuthUser.objects.values('id', 'username', 'email'))
-        return JsonResponse(users, safe=False)
+        fields = parse_fields(request.GET.get('fields'), USER_DIRECTORY_FIELDS) or USER_DIRECTORY_FIELDS
+        # One page of plain dicts at a time, seeking on the primary key
+        paginator = KeysetPagination(ordering=('id',))
+        users = paginator.paginate_queryset(AuthUser.objects.values(*fields), request)
+        return JsonResponse(paginator.get_paginated_data(users))
+    except serializers.ValidationError as e:
+        return JsonResponse(e.detail, status=400)
+    except APIException as e:
+        return JsonResponse({'error': str(e.detail)}, status=e.status_code)
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=500)
 
@@ -95,11 +217,12 @@ def create_user(request):
             if len(data['password']) < 8:
                 return Response({'error': 'Password must be at least 8 characters long'}, status=400)
             
-            user = AuthUser.objects.create_user(
-                username=data['username'],
-                email=data['email'],
-                password=data['password']
-            )
+            with password_hashing.slot():
+                user = AuthUser.objects.create_user(
+                    username=data['username'],
+                    email=data['email'],
+                    password=data['password']
+                )
             
             regular_group = Group.objects.get(name='Regular')
             user.groups.add(regular_group)
@@ -118,12 +241,14 @@ def create_user(request):
         return Response({'error': 'Invalid JSON format'}, status=400)
     except ValidationError as e:
         return Response({'error': str(e)}, status=400)
+    except HashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
 @csrf_exempt
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAdminUser])
 def assign_role(request):
     if request.method != 'POST':
@@ -142,8 +267,10 @@ def assign_role(request):
         if role in ['Admin', 'Moderator', 'Regular']:
             group = Group.objects.get(name=role)
             user.groups.add(group)
+            bump_role_version(user.id)
             return JsonResponse({'message': f'User assigned to {role} role successfully'})
         else:
+            bump_role_version(user.id)
             return JsonResponse({'error': 'Invalid role'}, status=400)
 
     except AuthUser.DoesNotExist:
@@ -168,6 +295,7 @@ def update_user(request, id):
         validate_email(data['email'])
         user.email = data['email']
         user.save()
+        evict_user_tokens(user)
         
         return JsonResponse({
             'id': user.id,
@@ -192,6 +320,7 @@ def delete_user(request, id):
         if not user:
             return JsonResponse({'error': 'User not found'}, status=404)
             
+        evict_user_tokens(user)
         user.delete()
         return JsonResponse({'message': 'User deleted successfully'}, status=200)
     except Exception as e:
@@ -207,7 +336,8 @@ def login_user(request):
         if 'username' not in data or 'password' not in data:
             return Response({'error': 'Username and password are required'}, status=400)
         
-        user = authenticate(username=data['username'], password=data['password'])
+        with password_hashing.slot():
+            user = authenticate(username=data['username'], password=data['password'])
         
         if user is not None:
             token, created = Token.objects.get_or_create(user=user)
@@ -224,13 +354,16 @@ def login_user(request):
             
     except json.JSONDecodeError:
         return Response({'error': 'Invalid JSON format'}, status=400)
+    except HashingBusy:
+        return hashing_busy_response()
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 def logout_user(request):
     try:
+        evict_token(request.user.auth_token.key)
         request.user.auth_token.delete()
         logout(request)
         return Response({'message': 'Successfully logged out'})
@@ -238,14 +371,14 @@ def logout_user(request):
         return Response({'error': str(e)}, status=500)
 
 @api_view(['GET'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAuthenticated])
 def get_user_profile(request):
     serializer = UserSerializer(request.user)
     return Response(serializer.data)
 
 @api_view(['POST'])
-@authentication_classes([TokenAuthentication])
+@authentication_classes([CachedTokenAuthentication])
 @permission_classes([IsAdminUser])
 def update_staff_status(request):
     user_id = request.data.get('user_id')
@@ -255,6 +388,7 @@ def update_staff_status(request):
         user = AuthUser.objects.get(id=user_id)
         user.is_staff = staff_status
         user.save()
+        evict_user_tokens(user)
         return Response({
             'message': f'Staff status updated for user {user.username}',
             'is_staff': user.is_staff
@@ -286,6 +420,8 @@ def make_user_admin(request):
         user.groups.add(admin_group)
         
         user.save()
+        evict_user_tokens(user)
+        bump_role_version(user.id)
         
         return Response({
             'message': f'User {user.username} is now an admin',
@@ -302,13 +438,19 @@ def make_user_admin(request):
         return Response({'error': str(e)}, status=500)
 
 class UserListCreate(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        users = AuthUser.objects.all()
-        serializer = UserSerializer(users, many=True)
-        return Response(serializer.data)
+        fields = parse_fields(request.query_params.get('fields'), UserSerializer.Meta.fields) or UserSerializer.Meta.fields
+        users = AuthUser.objects.only(*(name for name in fields if name != 'groups'))
+        if 'groups' in fields:
+            # All group ids for the page in one query instead of one per user
+            users = users.prefetch_related(Prefetch('groups', queryset=Group.objects.only('id')))
+        paginator = KeysetPagination(ordering=('id',))
+        page = paginator.paginate_queryset(users, request, view=self)
+        serializer = UserSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = UserSerializer(data=request.data)
@@ -318,59 +460,149 @@ class UserListCreate(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 class PostListCreate(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @collection_condition(post_collection, post_paginator)
     def get(self, request):
-        posts = Post.objects.all()
+        paginator = collection_paginator(request)
+        queryset = PostSerializer.setup_eager_loading(
+            post_collection(request), comments_limit=get_comments_limit(request)
+        )
+        posts = paginator.paginate_queryset(queryset, request, view=self)
         serializer = PostSerializer(posts, many=True)
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = PostSerializer(data=request.data, context={'request': request})
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                post = serializer.save()
+                publish(request.user.pk, [post])
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class PostBulkCreate(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = get_bulk_items(request)
+        valid, errors = validate_bulk(PostSerializer, items)
+        if errors and request.query_params.get('atomic') == 'true':
+            return bulk_response([], errors)
+
+        posts = [Post(author=request.user, **data) for index, data in valid]
+        with transaction.atomic():
+            created = Post.objects.bulk_create(posts, batch_size=config.get_setting('BULK_BATCH_SIZE'))
+            publish(request.user.pk, created)
+        return bulk_response(created, errors)
+
+class FollowView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, id):
+        if id == request.user.pk:
+            return Response({'error': 'You cannot follow yourself'}, status=status.HTTP_400_BAD_REQUEST)
+        if not AuthUser.objects.filter(pk=id).exists():
+            raise Http404
+        with transaction.atomic():
+            _, created = Follow.objects.get_or_create(follower=request.user, followee_id=id)
+            if created:
+                backfill(request.user.pk, id)
+        return Response({'following': id}, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    def delete(self, request, id):
+        with transaction.atomic():
+            deleted, _ = Follow.objects.filter(follower=request.user, followee_id=id).delete()
+            if deleted:
+                unfollow_cleanup(request.user.pk, id)
+        if not deleted:
+            raise Http404
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class TimelineView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # Entries, posts and authors come from one range scan of
+        # timeline_user_created_idx joined to posts; comments are one more query
+        queryset = TimelineEntry.objects.filter(user=request.user).select_related('post__author').prefetch_related(
+            Prefetch('post__comments', queryset=PostSerializer.comments_queryset(get_comments_limit(request)))
+        )
+        paginator = KeysetPagination()
+        entries = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = PostSerializer([entry.post for entry in entries], many=True)
+        return paginator.get_paginated_response(serializer.data)
+
 class PostDetail(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated, IsPostAuthor|IsModeratorUser|IsAdminUser]
 
-    def get_object(self, pk):
+    def get_object(self, pk, eager=False, comments_limit=None):
+        queryset = Post.objects.all()
+        if eager:
+            queryset = PostSerializer.setup_eager_loading(queryset, comments_limit=comments_limit)
         try:
-            return Post.objects.get(pk=pk)
+            return queryset.get(pk=pk)
         except Post.DoesNotExist:
             raise Http404
 
+    @detail_condition(Post)
     def get(self, request, pk):
-        post = self.get_object(pk)
-        serializer = PostSerializer(post)
-        return Response(serializer.data)
+        comments_limit = get_comments_limit(request)
+        variant = 'full' if comments_limit is None else f'latest-{comments_limit}'
+        data = get_cached_detail(Post, pk, variant)
+        if data is None:
+            post = self.get_object(pk, eager=True, comments_limit=comments_limit)
+            data = PostSerializer(post).data
+            set_cached_detail(post, data, variant)
+            return set_validators(Response(data), post)
+        return Response(data)
 
     def put(self, request, pk):
-        post = self.get_object(pk)
+        post = self.get_object(pk, eager=True)
         self.check_object_permissions(request, post)
+        modified = Response({'error': 'Post was modified; fetch it again'}, status=status.HTTP_412_PRECONDITION_FAILED)
+        if not if_match_passes(request, detail_etag(post)):
+            return modified
         serializer = PostSerializer(post, data=request.data)
         if serializer.is_valid():
-            serializer.save()
-            return Response(serializer.data)
+            with transaction.atomic():
+                if 'HTTP_IF_MATCH' in request.META:
+                    # Compare-and-swap on updated_at: if another write landed
+                    # since we read the row, this matches nothing
+                    if not Post.objects.filter(pk=pk, updated_at=post.updated_at).update(updated_at=timezone.now()):
+                        return modified
+                serializer.save()
+            # Write through so the next read is a hit
+            set_cached_detail(post, serializer.data)
+            return set_validators(Response(serializer.data), post)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
         post = self.get_object(pk)
         self.check_object_permissions(request, post)
+        # Delete signals drop the cached post and its comments
         post.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 class CommentListCreate(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @collection_condition(comment_collection)
     def get(self, request):
-        comments = Comment.objects.all()
-        serializer = CommentSerializer(comments, many=True)
-        return Response(serializer.data)
+        post_id = request.query_params.get('post')
+        if post_id is not None and not post_id.isdigit():
+            return Response({'error': 'post must be a post ID'}, status=status.HTTP_400_BAD_REQUEST)
+        comments = comment_collection(request).select_related('author')
+        paginator = collection_paginator(request)
+        page = paginator.paginate_queryset(comments, request, view=self)
+        serializer = CommentSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     def post(self, request):
         serializer = CommentSerializer(data=request.data, context={'request': request})
@@ -379,20 +611,58 @@ class CommentListCreate(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class CommentBulkCreate(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = get_bulk_items(request)
+        valid, errors = validate_bulk(BulkCommentSerializer, items)
+
+        # Resolve every referenced post in one query
+        post_ids = {data['post_id'] for index, data in valid}
+        existing = set(Post.objects.filter(pk__in=post_ids).values_list('id', flat=True))
+        for index, data in valid:
+            if data['post_id'] not in existing:
+                errors.append({'index': index, 'errors': {'post': ['Post not found.']}})
+        errors.sort(key=lambda error: error['index'])
+        if errors and request.query_params.get('atomic') == 'true':
+            return bulk_response([], errors)
+
+        comments = [
+            Comment(author=request.user, **data)
+            for index, data in valid if data['post_id'] in existing
+        ]
+        counts = Counter(comment.post_id for comment in comments)
+        with transaction.atomic():
+            created = Comment.objects.bulk_create(comments, batch_size=config.get_setting('BULK_BATCH_SIZE'))
+            if counts:
+                Post.objects.filter(pk__in=counts).update(comment_count=F('comment_count') + Case(
+                    *[When(pk=post_id, then=Value(count)) for post_id, count in counts.items()],
+                    output_field=IntegerField(),
+                ), updated_at=timezone.now())
+        invalidate_detail(Post, *counts)
+        return bulk_response(created, errors)
+
 class CommentDetail(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_object(self, pk):
         try:
-            return Comment.objects.get(pk=pk)
+            return Comment.objects.select_related('author').get(pk=pk)
         except Comment.DoesNotExist:
             raise Http404
 
+    @detail_condition(Comment)
     def get(self, request, pk):
-        comment = self.get_object(pk)
-        serializer = CommentSerializer(comment)
-        return Response(serializer.data)
+        data = get_cached_detail(Comment, pk)
+        if data is None:
+            comment = self.get_object(pk)
+            data = CommentSerializer(comment).data
+            set_cached_detail(comment, data)
+            return set_validators(Response(data), comment)
+        return Response(data)
 
     def put(self, request, pk):
         comment = self.get_object(pk)
@@ -404,7 +674,11 @@ class CommentDetail(APIView):
             
         serializer = CommentSerializer(comment, data=request.data, partial=True)
         if serializer.is_valid():
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
+                # The parent post embeds its comments, so its validators must change too
+                Post.objects.filter(pk=comment.post_id).update(updated_at=timezone.now())
+            set_cached_detail(comment, serializer.data)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -418,7 +692,7 @@ class CommentDetail(APIView):
                     "error": "You don't have permission to delete this comment"
                 }, status=status.HTTP_403_FORBIDDEN)
             
-            # Only delete the comment
+            # Only delete the comment; its delete signal updates the post's counter
             comment.delete()
             
             # Return a success message instead of blank response
@@ -435,8 +709,70 @@ class CommentDetail(APIView):
                 "error": str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class SyncView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        limit = KeysetPagination().get_page_size(request)
+        return Response(sync(request.user, request.query_params.get('cursor'), limit))
+
+class SearchView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not search_available():
+            return Response({'error': 'Search is not available on this database'}, status=status.HTTP_501_NOT_IMPLEMENTED)
+        kind = request.query_params.get('type', 'posts')
+        if kind not in SEARCH_INDEXES:
+            return Response({'error': f"type must be one of: {', '.join(SEARCH_INDEXES)}"}, status=status.HTTP_400_BAD_REQUEST)
+        match = build_match(request.query_params.get('q'))
+        if not match:
+            return Response({'error': 'q must contain at least one word'}, status=status.HTTP_400_BAD_REQUEST)
+        paginator = SearchPagination()
+        rows = paginator.paginate_search(kind, match, request)
+        return paginator.get_paginated_response(attach_results(kind, match, rows))
+
+class CacheStatsView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(cache_stats.snapshot())
+
+class MetricsView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        include_cache = request.query_params.get('cache', '1') != '0'
+        return HttpResponse(
+            request_metrics.render(include_cache=include_cache),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
+
+class ExportView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, kind):
+        if kind not in EXPORTS:
+            raise Http404
+        since = request.query_params.get('since')
+        if since is not None:
+            since = parse_datetime(since)
+            if since is None:
+                return Response({'error': 'since must be an ISO 8601 timestamp'}, status=status.HTTP_400_BAD_REQUEST)
+        response = StreamingHttpResponse(
+            iter_ndjson(kind, since=since, batch_size=config.get_setting('EXPORT_BATCH_SIZE')),
+            content_type='application/x-ndjson',
+        )
+        response['Content-Disposition'] = f'attachment; filename="{kind}.ndjson"'
+        return response
+
 class CreateTaskView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -455,7 +791,7 @@ class CreateTaskView(APIView):
                 metadata=data.get('metadata', {})
             )
             
-            logger.info(f"Task created successfully with ID: {task.id}")
+            logger.info("Task created successfully with ID: %s", task.id)
             return Response({
                 'message': 'Task created successfully!',
                 'task_id': task.id
@@ -468,38 +804,76 @@ class CreateTaskView(APIView):
             }, status=status.HTTP_404_NOT_FOUND)
             
         except ValueError as e:
-            logger.error(f"Task creation failed: {str(e)}")
+            logger.error("Task creation failed: %s", e)
             return Response({
                 'error': str(e)
             }, status=status.HTTP_400_BAD_REQUEST)
             
         except Exception as e:
-            logger.error(f"Unexpected error during task creation: {str(e)}")
+            logger.error("Unexpected error during task creation: %s", e)
             return Response({
                 'error': 'An unexpected error occurred'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+class BulkCreateTaskView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        logger.info("Received bulk task creation request")
+        items = get_bulk_items(request)
+        for item in items:
+            if isinstance(item, dict):
+                item.setdefault('assigned_to', request.user.id)
+
+        try:
+            tasks = TaskFactory.create_tasks(items, batch_size=config.get_setting('BULK_BATCH_SIZE'))
+        except TaskBatchError as e:
+            logger.error("Bulk task creation failed for %d items", len(e.errors))
+            return Response({
+                'errors': [{'index': index, 'error': error} for index, error in e.errors.items()]
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        logger.info("Created %d tasks in bulk", len(tasks))
+        return Response({
+            'message': 'Tasks created successfully!',
+            'task_ids': [task.id for task in tasks]
+        }, status=status.HTTP_201_CREATED)
+
+class NextTasksView(APIView):
+    authentication_classes = [CachedTokenAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        limit = request.query_params.get('limit', '10')
+        if not limit.isdigit() or int(limit) < 1:
+            return Response({'error': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = min(int(limit), config.get_setting('MAX_PAGE_SIZE'))
+        # Highest priority first, oldest first within a level
+        tasks = Task.objects.filter(
+            assigned_to=request.user, priority_level__isnull=False
+        ).order_by('-priority_level', 'created_at', 'id')[:limit]
+        serializer = TaskSerializer(tasks, many=True)
+        return Response({'results': serializer.data})
+
 class TaskListView(APIView):
-    authentication_classes = [TokenAuthentication]
+    authentication_classes = [CachedTokenAuthentication]
     permission_classes = [IsAuthenticated]
 
+    @collection_condition(task_collection)
     def get(self, request):
         logger.info("Retrieving task list")
         try:
             # Get tasks assigned to the user
-            tasks = Task.objects.filter(assigned_to=request.user)
-            return Response({
-                'tasks': [{
-                    'id': task.id,
-                    'title': task.title,
-                    'description': task.description,
-                    'task_type': task.task_type,
-                    'metadata': task.metadata,
-                    'created_at': task.created_at
-                } for task in tasks]
-            })
+            tasks = task_collection(request)
+            paginator = collection_paginator(request)
+            page = paginator.paginate_queryset(tasks, request, view=self)
+            serializer = TaskSerializer(page, many=True)
+            return paginator.get_paginated_response(serializer.data)
+        except APIException:
+            raise
         except Exception as e:
-            logger.error(f"Error retrieving tasks: {str(e)}")
+            logger.error("Error retrieving tasks: %s", e)
             return Response({
                 'error': 'Error retrieving tasks'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
@@ -11,7 +11,32 @@ class ConfigManager:
         self.settings = {
             "DEFAULT_TASK_PRIORITY": "Medium",
             "ENABLE_NOTIFICATIONS": True,
-            "RATE_LIMIT": 50
+            "RATE_LIMIT": 50,
+            "RATE_LIMIT_PERIOD": 60,
+            "RATE_LIMIT_BACKEND": "local",
+            "PAGE_SIZE": 20,
+            "MAX_PAGE_SIZE": 100,
+            "MAX_EMBEDDED_COMMENTS": 50,
+            "DETAIL_CACHE_TIMEOUT": 300,
+            "AUTH_TOKEN_CACHE_TTL": 60,
+            "AUTH_TOKEN_CACHE_SIZE": 10000,
+            "AUTH_TOKEN_CACHE_SHARED": True,
+            "ROLE_CACHE_TIMEOUT": 300,
+            "MAX_BULK_ITEMS": 1000,
+            "BULK_BATCH_SIZE": 500,
+            "EXPORT_BATCH_SIZE": 1000,
+            "PASSWORD_HASH_CONCURRENCY": 4,
+            "PASSWORD_HASH_QUEUE": 16,
+            "PASSWORD_HASH_WAIT": 2,
+            "LOG_QUEUE_SIZE": 10000,
+            "LOG_JSON": False,
+            "METRICS_SAMPLE_RATE": 1.0,
+            "METRICS_QUERY_THRESHOLD": 30,
+            "FANOUT_ASYNC_THRESHOLD": 1000,
+            "FANOUT_WORKERS": 2,
+            "TIMELINE_BACKFILL": 100,
+            "SYNC_SETTLE_SECONDS": 2,
+            "TOMBSTONE_RETENTION_DAYS": 30
         }
 
     def get_setting(self, key):
@@ -1,4 +1,63 @@
+import atexit
+import copy
+import json
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from singletons.config_manager import ConfigManager
+
+_exception_formatter = logging.Formatter()
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records instead of blocking when the buffer is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        """
+        Merge args into the message and render the traceback to exc_text,
+        both here on the calling thread, but leave the formatting itself to
+        the listener's formatter: unlike QueueHandler.prepare this keeps
+        the message and exc_text apart, so JsonFormatter can emit them as
+        separate fields.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _exception_formatter.formatException(record.exc_info)
+            # Tracebacks hold frames alive; the text is all the listener needs
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        # Called under the handler lock, so the counter needs no extra locking
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; pass extra={'context': {...}} for structured fields."""
+
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        context = getattr(record, "context", None)
+        if context:
+            payload.update(context)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, default=str)
 
 class LoggerSingleton:
     _instance = None
@@ -10,12 +69,26 @@ class LoggerSingleton:
         return cls._instance
 
     def _initialize(self):
+        config = ConfigManager()
         self.logger = logging.getLogger("task_logger")
+
+        # The slow stream write happens on the listener thread; request
+        # threads only put the record on a bounded queue
         handler = logging.StreamHandler()
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-        handler.setFormatter(formatter)
-        self.logger.addHandler(handler)
+        if config.get_setting("LOG_JSON"):
+            handler.setFormatter(JsonFormatter())
+        else:
+            handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        self.queue_handler = DroppingQueueHandler(queue.Queue(maxsize=config.get_setting("LOG_QUEUE_SIZE")))
+        self.listener = QueueListener(self.queue_handler.queue, handler, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+        self.logger.addHandler(self.queue_handler)
         self.logger.setLevel(logging.INFO)
 
     def get_logger(self):
-        return self.logger
\ No newline at end of file
+        return self.logger
+
+    def get_dropped_count(self):
+        return self.queue_handler.dropped